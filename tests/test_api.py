@@ -0,0 +1,136 @@
+import unittest
+from unittest import mock
+
+from who_messed_up import api
+from who_messed_up.api import EventQuerySpec, TableQuerySpec, fetch_events_batched, fetch_tables_batched
+
+
+class FetchEventsBatchedTests(unittest.TestCase):
+    def test_paginates_each_alias_independently(self):
+        pages = {
+            ("a", 0.0): ([{"timestamp": 10, "sourceID": 1}], 10),
+            ("a", 11.0): ([{"timestamp": 20, "sourceID": 1}], None),
+            ("b", 0.0): ([{"timestamp": 5, "sourceID": 2}], None),
+        }
+        requests_seen = []
+
+        def fake_gql(session, token, query, variables):
+            report = {}
+            idx = 0
+            while f"dataType{idx}" in variables:
+                key = (variables[f"dataType{idx}"], variables[f"start{idx}"])
+                rows, next_ts = pages[key]
+                report[f"e{idx}"] = {"data": [dict(row) for row in rows], "nextPageTimestamp": next_ts}
+                idx += 1
+            requests_seen.append(idx)
+            return {"reportData": {"report": report}}
+
+        specs = [
+            EventQuerySpec(key="first", data_type="a", start=0.0, end=100.0),
+            EventQuerySpec(key="second", data_type="b", start=0.0, end=100.0),
+        ]
+        with mock.patch.object(api, "gql", fake_gql):
+            results = fetch_events_batched(
+                None,
+                "token",
+                code="report",
+                specs=specs,
+                actor_names={1: "Alpha", 2: "Beta"},
+                sleep_seconds=0,
+            )
+
+        self.assertEqual(requests_seen, [2, 1])
+        self.assertEqual([row["timestamp"] for row in results["first"]], [10, 20])
+        self.assertEqual([row["timestamp"] for row in results["second"]], [5])
+        self.assertEqual(results["second"][0]["source"]["name"], "Beta")
+
+
+class FetchTablesBatchedTests(unittest.TestCase):
+    def test_aliases_tables_into_shared_requests(self):
+        calls = []
+
+        def fake_gql(session, token, query, variables):
+            calls.append(variables)
+            count = sum(1 for key in variables if key.startswith("dataType"))
+            return {
+                "reportData": {
+                    "report": {
+                        f"t{idx}": {"data": {"entries": [{"id": variables[f"fightIDs{idx}"][0]}]}}
+                        for idx in range(count)
+                    }
+                }
+            }
+
+        specs = [
+            TableQuerySpec(key=(fight_id, data_type), data_type=data_type, fight_id=fight_id, start=0, end=10)
+            for fight_id in (1, 2)
+            for data_type in ("DamageDone", "Healing")
+        ]
+        with mock.patch.object(api, "gql", fake_gql), mock.patch.object(
+            api, "_table_cache", api.ResultCache(ttl_seconds=60)
+        ):
+            tables = fetch_tables_batched(None, "token", code="abc", specs=specs, batch_size=3)
+            tables[(2, "Healing")]["entries"].clear()
+            again = fetch_tables_batched(None, "token", code="abc", specs=specs[1:], batch_size=3)
+            other_window = fetch_tables_batched(
+                None, "token", code="abc", specs=[TableQuerySpec(key="x", data_type="Healing", fight_id=2, start=0, end=20)]
+            )
+
+        self.assertEqual(len(calls), 3)
+        self.assertEqual(list(again), [spec.key for spec in specs[1:]])
+        self.assertEqual(again[(2, "Healing")], {"entries": [{"id": 2}]})
+        self.assertEqual(other_window["x"], {"entries": [{"id": 2}]})
+
+
+class GqlResponseCacheTests(unittest.TestCase):
+    def test_repeated_query_is_served_from_cache_as_fresh_objects(self):
+        response = mock.Mock()
+        response.content = b'{"data": {"reportData": {"report": {"title": "Raid"}}}}'
+        session = mock.Mock()
+        session.post.return_value = response
+        cache = api.ResultCache(ttl_seconds=60)
+
+        with mock.patch.object(api, "_gql_response_cache", cache):
+            first = api.gql(session, "token", "query { x }", {"code": "abc"})
+            first["reportData"]["report"]["title"] = "mutated"
+            second = api.gql(session, "token", "query { x }", {"code": "abc"})
+            api.gql(session, "other-token", "query { x }", {"code": "abc"})
+
+        self.assertEqual(second["reportData"]["report"]["title"], "Raid")
+        self.assertEqual(session.post.call_count, 2)
+
+    def test_event_pages_are_not_retained(self):
+        response = mock.Mock()
+        response.content = b'{"data": {"reportData": {"report": {"events": {"data": [], "nextPageTimestamp": null}}}}}'
+        session = mock.Mock()
+        session.post.return_value = response
+        cache = api.ResultCache(ttl_seconds=60)
+        variables = {"code": "abc", "dataType": "Deaths", "start": 0.0, "end": 10.0, "limit": 10000}
+
+        with mock.patch.object(api, "_gql_response_cache", cache):
+            api.gql(session, "token", api.EVENTS_QUERY, variables)
+            api.gql(session, "token", api.EVENTS_QUERY, variables)
+
+        self.assertIsNone(cache.get(api._gql_cache_key("token", api.EVENTS_QUERY, variables)))
+        self.assertEqual(session.post.call_count, 2)
+
+
+class TokenCacheTests(unittest.TestCase):
+    def test_client_credentials_token_is_reused(self):
+        response = mock.Mock()
+        response.json.return_value = {"access_token": "bearer"}
+        cache = api.ResultCache(ttl_seconds=60)
+
+        with mock.patch.object(api, "_token_cache", cache), mock.patch.object(
+            api.requests, "post", return_value=response
+        ) as post:
+            first = api.get_token_from_client("client", "secret")
+            second = api.get_token_from_client("client", "secret")
+            api.get_token_from_client("client", "other-secret")
+
+        self.assertEqual((first, second), ("bearer", "bearer"))
+        self.assertEqual(post.call_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,19 @@
+import unittest
+
+from who_messed_up.services.dimensius_deaths import RecentEventProbe
+
+
+class RecentEventProbeTests(unittest.TestCase):
+    def test_matches_window_for_ordered_and_out_of_order_probes(self):
+        probe = RecentEventProbe({(1, "Alpha"): [1000.0, 5000.0, 20000.0]}, window_ms=2000.0)
+
+        self.assertTrue(probe.has_recent((1, "Alpha"), 6000.0))
+        self.assertFalse(probe.has_recent((1, "Alpha"), 15000.0))
+        self.assertTrue(probe.has_recent((1, "Alpha"), 21000.0))
+        self.assertTrue(probe.has_recent((1, "Alpha"), 2500.0))
+        self.assertFalse(probe.has_recent((1, "Alpha"), 30000.0))
+        self.assertFalse(probe.has_recent((2, "Alpha"), 6000.0))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,142 @@
+import unittest
+
+from who_messed_up.api import Fight
+from who_messed_up.services.dimensius_phase_one import (
+    _collect_debuff_intervals,
+    _collect_overlap_starts,
+    _early_mass_starts,
+)
+
+
+def _debuff(ts, event_type, player="Alpha"):
+    return {"timestamp": ts, "type": event_type, "targetName": player}
+
+
+class OverlapStartsTests(unittest.TestCase):
+    def setUp(self):
+        self.fight = Fight(id=1, name="Dimensius", start=0.0, end=10000.0, kill=False)
+
+    def _overlaps(self, rg_events, em_events, death_cutoffs=None):
+        result = _collect_overlap_starts(
+            [self.fight],
+            {1: rg_events},
+            {1: em_events},
+            death_cutoffs=death_cutoffs,
+        )
+        return result.get(1, [])
+
+    def test_overlapping_spans(self):
+        rg = [_debuff(100, "applydebuff"), _debuff(500, "removedebuff")]
+        em = [_debuff(300, "applydebuff"), _debuff(800, "removedebuff")]
+
+        self.assertEqual(self._overlaps(rg, em), [(300.0, "Alpha")])
+
+    def test_nested_stacks_hold_until_last_remove(self):
+        rg = [
+            _debuff(100, "applydebuff"),
+            _debuff(200, "applydebuffstack"),
+            _debuff(300, "removedebuffstack"),
+            _debuff(900, "removedebuff"),
+        ]
+        em = [
+            _debuff(400, "applydebuff"),
+            _debuff(600, "removedebuff"),
+            _debuff(950, "applydebuff"),
+            _debuff(1000, "removedebuff"),
+        ]
+
+        self.assertEqual(self._overlaps(rg, em), [(400.0, "Alpha")])
+
+    def test_remove_at_the_same_time_as_apply_is_not_an_overlap(self):
+        rg = [_debuff(100, "applydebuff"), _debuff(300, "removedebuff")]
+        em = [_debuff(300, "applydebuff"), _debuff(500, "removedebuff")]
+
+        self.assertEqual(self._overlaps(rg, em), [])
+        self.assertEqual(self._overlaps(em, rg), [])
+
+    def test_remove_logged_before_its_apply_closes_the_span(self):
+        rg = [_debuff(200, "applydebuff"), _debuff(150, "removedebuff")]
+        em = [_debuff(400, "applydebuff"), _debuff(600, "removedebuff")]
+
+        self.assertEqual(self._overlaps(rg, em), [])
+
+    def test_death_cutoff_drops_later_events_and_closes_open_spans(self):
+        rg = [_debuff(100, "applydebuff")]
+
+        self.assertEqual(self._overlaps(rg, [_debuff(2000, "applydebuff")], {1: 1500.0}), [])
+        self.assertEqual(
+            self._overlaps(rg, [_debuff(1000, "applydebuff"), _debuff(3000, "removedebuff")], {1: 1500.0}),
+            [(1000.0, "Alpha")],
+        )
+
+    def test_debuffs_open_at_fight_end(self):
+        rg = [_debuff(100, "applydebuff")]
+        em = [_debuff(9000, "applydebuff")]
+
+        self.assertEqual(self._overlaps(rg, em), [(9000.0, "Alpha")])
+        self.assertEqual(self._overlaps(rg, [_debuff(10000, "applydebuff")]), [])
+
+
+class DebuffIntervalsTests(unittest.TestCase):
+    def test_intervals_merge_stacks_and_close_at_cutoff(self):
+        fight = Fight(id=1, name="Dimensius", start=0.0, end=10000.0, kill=False)
+        events = [
+            _debuff(100, "applydebuff"),
+            _debuff(200, "applydebuffstack"),
+            _debuff(300, "removedebuffstack"),
+            _debuff(400, "removedebuff"),
+            _debuff(700, "applydebuff", "Beta"),
+            _debuff(900, "applydebuff"),
+        ]
+
+        intervals, applies = _collect_debuff_intervals(
+            [fight], {1: events}, capture_applies=True, death_cutoffs={1: 5000.0}
+        )
+
+        self.assertEqual(dict(intervals[1]), {"Alpha": [(100.0, 400.0), (900.0, 5000.0)], "Beta": [(700.0, 5000.0)]})
+        self.assertEqual([ts for ts, _ in applies[1]], [100.0, 200.0, 700.0, 900.0])
+
+
+class EarlyMassStartsTests(unittest.TestCase):
+    def test_window_boundaries(self):
+        set_starts = [2000.0, 6000.0]
+
+        def credited(start):
+            return _early_mass_starts({"Alpha": [(start, start + 100.0)]}, set_starts, 1000.0)
+
+        self.assertEqual(credited(999.0), [])
+        self.assertEqual(credited(1000.0), [("Alpha", 1000.0)])
+        self.assertEqual(credited(1999.0), [("Alpha", 1999.0)])
+        self.assertEqual(credited(2000.0), [])
+        self.assertEqual(credited(5000.0), [("Alpha", 5000.0)])
+        self.assertEqual(credited(6000.0), [])
+
+    def test_matches_linear_scan_and_credits_each_set_once(self):
+        set_starts = [2000.0, 2500.0, 6000.0]
+        window_ms = 1000.0
+        intervals = {
+            "Alpha": [(1000.0, 1100.0), (1500.0, 1600.0), (1600.0, 1700.0), (2000.0, 2100.0)],
+            "Beta": [(1500.0, 1600.0), (5000.0, 5100.0), (6000.0, 6100.0)],
+        }
+
+        expected = []
+        seen = set()
+        for player, spans in intervals.items():
+            for start, _ in spans:
+                for set_start in set_starts:
+                    if set_start - window_ms <= start < set_start:
+                        if (player, set_start) in seen:
+                            continue
+                        seen.add((player, set_start))
+                        expected.append((player, start))
+                        break
+
+        self.assertEqual(_early_mass_starts(intervals, set_starts, window_ms), expected)
+        self.assertEqual(
+            expected,
+            [("Alpha", 1000.0), ("Alpha", 1500.0), ("Beta", 1500.0), ("Beta", 5000.0)],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
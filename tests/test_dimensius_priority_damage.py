@@ -0,0 +1,70 @@
+import unittest
+
+from who_messed_up.api import _apply_actor_names
+from who_messed_up.services.dimensius_priority_damage import (
+    _collect_target_damage,
+    _split_events_by_target,
+    _target_names_by_id,
+)
+
+
+class SplitEventsByTargetTests(unittest.TestCase):
+    def test_split_totals_match_per_target_queries(self):
+        actor_names = {1: "Alpha", 2: "Beta", 10: "Artoshion", 11: "Pargoth", 12: "Pargoth", 13: "Voidwarden"}
+        actor_owners = {}
+        enemy_names = ["Artoshion", "Pargoth", "Voidwarden"]
+        raw_events = [
+            {"timestamp": 100, "sourceID": 1, "targetID": 10, "amount": 500},
+            {"timestamp": 110, "sourceID": 2, "targetID": 11, "amount": 300, "absorbed": 20},
+            {"timestamp": 120, "sourceID": 1, "targetID": 12, "amount": 250},
+            {"timestamp": 130, "sourceID": 2, "targetID": 13, "amount": 75},
+            # Target missing from masterData; the server still matched it by name.
+            {"timestamp": 140, "sourceID": 1, "targetID": 50, "target": {"name": "Voidwarden"}, "amount": 40},
+            {"timestamp": 150, "sourceID": 2, "targetID": 10, "amount": 900},
+        ]
+
+        def server_target_name(event):
+            return actor_names.get(event["targetID"]) or event.get("target", {}).get("name")
+
+        def collect(events):
+            damage, _ = _collect_target_damage(events, actor_names=actor_names, actor_owners=actor_owners)
+            return dict(damage)
+
+        expected = {}
+        for name in enemy_names:
+            per_target = [dict(event) for event in raw_events if server_target_name(event) == name]
+            for event in per_target:
+                _apply_actor_names(event, actor_names)
+            expected[name] = collect(per_target)
+
+        combined = [dict(event) for event in raw_events]
+        for event in combined:
+            _apply_actor_names(event, actor_names)
+        split = _split_events_by_target(combined, _target_names_by_id(actor_names, enemy_names))
+
+        self.assertEqual({name: collect(split.get(name, ())) for name in enemy_names}, expected)
+        self.assertEqual(expected["Voidwarden"], {"Beta": 75.0, "Alpha": 40.0})
+        self.assertEqual(expected["Pargoth"], {"Beta": 320.0, "Alpha": 250.0})
+
+
+class CollectTargetDamageTests(unittest.TestCase):
+    def test_pet_damage_is_credited_to_owner_after_name_injection(self):
+        actor_names = {1: "Alpha", 5: "Wolf", 10: "Artoshion"}
+        events = [
+            {"timestamp": 100, "sourceID": 5, "targetID": 10, "amount": 30},
+            {"timestamp": 110, "sourceID": 5, "targetID": 10, "amount": 20},
+            {"timestamp": 120, "sourceID": 1, "targetID": 10, "amount": 50},
+        ]
+        for event in events:
+            _apply_actor_names(event, actor_names)
+
+        damage, phase_start = _collect_target_damage(
+            events, actor_names=actor_names, actor_owners={5: 1}, track_phase_start=True
+        )
+
+        self.assertEqual(dict(damage), {"Alpha": 100.0})
+        self.assertEqual(phase_start, 100.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,40 @@
+import unittest
+
+from who_messed_up.services.ghosts import _process_ghost_events
+
+GHOST_ID = 1224737
+
+
+def _apply(ts, player, **ability):
+    event = {"timestamp": ts, "type": "applydebuff", "targetName": player}
+    event.update(ability)
+    return event
+
+
+class ProcessGhostEventsTests(unittest.TestCase):
+    def _counted(self, events):
+        return _process_ghost_events(
+            events, grace_end=0.0, ability_id=GHOST_ID, cutoff=None, mode="all"
+        )
+
+    def test_int_mismatch_is_skipped(self):
+        events = [
+            _apply(100, "Alpha", abilityGameID=GHOST_ID),
+            _apply(200, "Beta", abilityGameID=999),
+        ]
+
+        self.assertEqual(self._counted(events), [("Alpha", 100.0)])
+
+    def test_string_and_nested_ids_still_match(self):
+        events = [
+            _apply(100, "Alpha", abilityGameID=str(GHOST_ID)),
+            _apply(200, "Beta", ability={"id": GHOST_ID, "name": "Ghost"}),
+            _apply(300, "Gamma", abilityGameID="999"),
+            _apply(400, "Delta", ability={"id": 999}),
+        ]
+
+        self.assertEqual(self._counted(events), [("Alpha", 100.0), ("Beta", 200.0)])
+
+
+if __name__ == "__main__":
+    unittest.main()
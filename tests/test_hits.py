@@ -0,0 +1,60 @@
+import unittest
+
+from who_messed_up.api import Fight
+from who_messed_up.services.hits import _iter_hit_events
+
+
+def _hit(ts, target):
+    return {"timestamp": ts, "targetName": target}
+
+
+class IterHitEventsTests(unittest.TestCase):
+    def setUp(self):
+        self.fights = [Fight(id=1, name="Boss", start=0.0, end=1000.0, kill=False)]
+        self.events = [
+            _hit(100, "Alpha"),
+            _hit(200, "Beta"),
+            _hit(300, "Alpha"),
+            _hit(600, "Gamma"),
+            _hit(850, "Delta"),
+            _hit(950, "Beta"),
+        ]
+        self.fetched = {("hits", 1): self.events}
+
+    def _timestamps(self, death_cutoffs, exclude_final_ms, first_hit_only=False):
+        return [
+            event["timestamp"]
+            for event in _iter_hit_events(
+                self.fights,
+                self.fetched,
+                death_cutoffs,
+                exclude_final_ms=exclude_final_ms,
+                first_hit_only=first_hit_only,
+            )
+        ]
+
+    def test_neither_cutoff_passes_events_through_unchanged(self):
+        streamed = list(
+            _iter_hit_events(self.fights, self.fetched, {}, exclude_final_ms=None, first_hit_only=False)
+        )
+
+        self.assertEqual(len(streamed), len(self.events))
+        self.assertTrue(all(out is src for out, src in zip(streamed, self.events)))
+
+    def test_death_cutoff_only(self):
+        self.assertEqual(self._timestamps({1: 600.0}, None), [100, 200, 300])
+
+    def test_exclude_final_only(self):
+        self.assertEqual(self._timestamps({}, 150.0), [100, 200, 300, 600])
+
+    def test_both_cutoffs_use_the_earlier(self):
+        self.assertEqual(self._timestamps({1: 900.0}, 400.0), [100, 200, 300])
+        self.assertEqual(self._timestamps({1: 300.0}, 100.0), [100, 200])
+
+    def test_first_hit_only_applies_after_cutoffs(self):
+        self.assertEqual(self._timestamps({}, None, first_hit_only=True), [100, 200, 600, 850])
+        self.assertEqual(self._timestamps({1: 900.0}, None, first_hit_only=True), [100, 200, 600, 850])
+
+
+if __name__ == "__main__":
+    unittest.main()
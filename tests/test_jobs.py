@@ -0,0 +1,38 @@
+import unittest
+from unittest import mock
+
+from who_messed_up import api
+from who_messed_up.cache import ResultCache
+from who_messed_up.jobs import JobManager
+
+
+class ForcedRefreshTests(unittest.TestCase):
+    def test_forced_refresh_skips_cached_overview(self):
+        response = mock.Mock()
+        response.content = b'{"data": {"reportData": {"report": {"title": "Raid", "fights": []}}}}'
+        session = mock.Mock()
+        session.post.return_value = response
+        manager = JobManager(ResultCache(ttl_seconds=60))
+        manager.register_handler(
+            "overview",
+            lambda payload: api.gql(session, "token", api.REPORT_OVERVIEW_QUERY, {"code": payload["code"]}),
+        )
+
+        with mock.patch.object(api, "_gql_response_cache", ResultCache(ttl_seconds=60)):
+            # Two distinct jobs share the overview, so the second is served from the response cache.
+            manager.enqueue("overview", {"code": "abc"})
+            manager._queue.join()
+            manager.enqueue("overview", {"code": "abc", "fight": 1})
+            manager._queue.join()
+            self.assertEqual(session.post.call_count, 1)
+
+            job, immediate = manager.enqueue("overview", {"code": "abc"}, bust_cache=True)
+            manager._queue.join()
+
+        self.assertFalse(immediate)
+        self.assertEqual(job.status, "completed")
+        self.assertEqual(session.post.call_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
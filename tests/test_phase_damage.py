@@ -0,0 +1,115 @@
+import threading
+import unittest
+from unittest import mock
+
+from who_messed_up.api import Fight
+from who_messed_up.services import phase_damage
+
+
+ACTOR_NAMES = {1: "Pew", 2: "Tanky", 3: "Healy"}
+DETAILS = {
+    "tanks": [{"name": "Tanky"}],
+    "healers": [{"name": "Healy"}],
+    "dps": [{"name": "Pew", "type": "Mage"}],
+}
+REPORT_SCALE = {"AAAA": 1.0, "BBBB": 1.5}
+
+
+class PhaseDamageFetchPathTests(unittest.TestCase):
+    def setUp(self):
+        self.fights = [
+            Fight(id=1, name="Boss", start=0.0, end=60000.0, kill=False),
+            Fight(id=2, name="Boss", start=70000.0, end=130000.0, kill=True),
+        ]
+        self.sessions_by_code = {}
+        self.table_calls = []
+        self.lock = threading.Lock()
+
+        def fake_fetch_fights(session, bearer, code):
+            with self.lock:
+                self.sessions_by_code[code] = session
+            return list(self.fights), dict(ACTOR_NAMES), {1: "Mage", 2: "Warrior", 3: "Priest"}, {}
+
+        def fake_details(session, bearer, *, code, fight_ids):
+            return DETAILS, {fight_id: DETAILS for fight_id in fight_ids}
+
+        def fake_tables(session, bearer, *, code, specs, batch_size=20):
+            with self.lock:
+                self.table_calls.append((code, session))
+            scale = REPORT_SCALE[code]
+            tables = {}
+            for spec in specs:
+                phase_id, fight_id, data_type = spec.key
+                base = scale * fight_id * (10 if phase_id == "1" else 1)
+                if data_type == "DamageDone":
+                    entries = [{"id": 1, "total": 100 * base}, {"id": 2, "total": 40 * base}]
+                else:
+                    entries = [{"id": 3, "total": 70 * base}, {"id": 1, "total": 5 * base}]
+                tables[spec.key] = {"entries": entries}
+            return tables
+
+        patches = [
+            mock.patch.object(phase_damage, "load_env", lambda: None),
+            mock.patch.object(phase_damage, "_resolve_token", lambda *args: "token"),
+            mock.patch.object(phase_damage, "fetch_fights", fake_fetch_fights),
+            mock.patch.object(phase_damage, "fetch_player_details_breakdown", fake_details),
+            mock.patch.object(phase_damage, "fetch_tables_batched", fake_tables),
+        ]
+        for patcher in patches:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _single(self, code, **kwargs):
+        return phase_damage._fetch_phase_damage_summary_single(
+            report_code=code,
+            phases=["1", "2"],
+            phase_labels=phase_damage.NEXUS_PHASE_LABELS,
+            **kwargs,
+        )
+
+    @staticmethod
+    def _totals(summary):
+        return {
+            (entry.player, metric.phase_id): metric.total_amount
+            for entry in summary.entries
+            for metric in entry.metrics
+        }
+
+    def test_concurrent_pulls_match_sequential_pulls(self):
+        concurrent = self._single("AAAA")
+        sequential = self._single("AAAA", concurrent_pulls=False)
+
+        self.assertEqual(concurrent.entries, sequential.entries)
+        self.assertEqual(
+            self._totals(sequential),
+            {
+                ("Tanky", "1"): 1200.0,
+                ("Tanky", "2"): 120.0,
+                ("Healy", "1"): 2100.0,
+                ("Healy", "2"): 210.0,
+                ("Pew", "1"): 3000.0,
+                ("Pew", "2"): 300.0,
+            },
+        )
+
+    def test_extra_reports_use_worker_sessions_and_match_sequential_merge(self):
+        merged = phase_damage.fetch_phase_damage_summary(
+            report_code="AAAA", phases=["1", "2"], extra_report_codes=["BBBB"]
+        )
+
+        # Each report's tables were fetched on the worker session it loaded its fights with.
+        self.assertEqual(len(self.table_calls), 4)
+        for code, session in self.table_calls:
+            self.assertIs(session, self.sessions_by_code[code])
+            self.assertIsNot(session, phase_damage.shared_session())
+
+        expected = {}
+        for code in ("AAAA", "BBBB"):
+            for key, total in self._totals(self._single(code, concurrent_pulls=False)).items():
+                expected[key] = max(expected.get(key, 0.0), total)
+        self.assertEqual(self._totals(merged), expected)
+        self.assertEqual(merged.source_reports, ["AAAA", "BBBB"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -299,35 +299,25 @@ def count_hits(
             continue
 
         hits_by_player[target] += 1
-        hits_by_player_ability[(target, ability)] += 1
+        hits_by_player_ability[ability_key] += 1
 
+        # Parse the fight id once; it feeds both the per-player and per-fight tallies.
+        fight_key: Optional[int] = None
         fight_raw = normalized.get("fight_id")
         if fight_raw is not None:
             try:
                 fight_key = int(fight_raw)
             except (TypeError, ValueError):
                 fight_key = None
-            if fight_key is not None:
-                hits_by_player_fight[(target, fight_key)] += 1
+        if fight_key is not None:
+            hits_by_player_fight[(target, fight_key)] += 1
+            fight_total_hits[fight_key] += 1
 
         if isinstance(damage_value, (int, float)):
-            damage_by_player[target] += float(damage_value)
-        fight_id = normalized.get("fight_id")
-        if isinstance(damage_value, (int, float)) and fight_id is not None:
-            try:
-                fight_key = int(fight_id)
-            except (TypeError, ValueError):
-                fight_key = None
-            if fight_key is not None:
-                fight_total_damage[fight_key] += float(damage_value)
-                fight_total_hits[fight_key] += 1
-        elif fight_id is not None:
-            try:
-                fight_key = int(fight_id)
-            except (TypeError, ValueError):
-                fight_key = None
+            damage = float(damage_value)
+            damage_by_player[target] += damage
             if fight_key is not None:
-                fight_total_hits[fight_key] += 1
+                fight_total_damage[fight_key] += damage
         if isinstance(timestamp, (int, float)):
             last_hit_timestamp[ability_key] = float(timestamp)
 
@@ -3,14 +3,55 @@ Utilities for querying the Warcraft Logs GraphQL API.
 """
 from __future__ import annotations
 
+import hashlib
+import json
+import os
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Dict, Iterable, Iterator, List, Optional, Any, Tuple
+from typing import Callable, Dict, Hashable, Iterable, Iterator, List, Mapping, Optional, Any, Sequence, Tuple, TypeVar
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import orjson as _orjson  # type: ignore
+except Exception:  # pragma: no cover - optional dependency
+    _orjson = None  # type: ignore
+
+from .cache import ResultCache
 
 API_URL = "https://www.warcraftlogs.com/api/v2/client"
 OAUTH_URL = "https://www.warcraftlogs.com/oauth/token"
+DEFAULT_FETCH_WORKERS = 6
+PLAYER_DETAILS_BATCH_SIZE = 25
+EVENTS_BATCH_SIZE = 20
+TABLES_BATCH_SIZE = 20
+HTTP_POOL_SIZE = 32
+HTTP_RETRY_TOTAL = 3
+HTTP_RETRY_BACKOFF = 0.3
+HTTP_RETRY_STATUSES = (429, 500, 502, 503, 504)
+IDLE_WORKER_SESSIONS_MAX = DEFAULT_FETCH_WORKERS * 2
+ABILITY_NAME_CACHE_TTL = float(os.getenv("WHO_MESSED_UP_ABILITY_CACHE_TTL", "3600"))
+ABILITY_NAME_CACHE_MAX_ENTRIES = int(os.getenv("WHO_MESSED_UP_ABILITY_CACHE_MAX_ENTRIES", "128"))
+GQL_CACHE_TTL = float(os.getenv("WHO_MESSED_UP_GQL_CACHE_TTL", "300"))
+GQL_CACHE_MAX_ENTRIES = int(os.getenv("WHO_MESSED_UP_GQL_CACHE_MAX_ENTRIES", "512"))
+TABLE_CACHE_TTL = float(os.getenv("WHO_MESSED_UP_TABLE_CACHE_TTL", "300"))
+TABLE_CACHE_MAX_ENTRIES = int(os.getenv("WHO_MESSED_UP_TABLE_CACHE_MAX_ENTRIES", "256"))
+TOKEN_CACHE_TTL = float(os.getenv("WHO_MESSED_UP_TOKEN_CACHE_TTL", "3600"))
+
+_K = TypeVar("_K")
+_T = TypeVar("_T")
+
+_ability_name_cache = ResultCache(ttl_seconds=ABILITY_NAME_CACHE_TTL, max_entries=ABILITY_NAME_CACHE_MAX_ENTRIES)
+_gql_response_cache = ResultCache(ttl_seconds=GQL_CACHE_TTL, max_entries=GQL_CACHE_MAX_ENTRIES)
+_table_cache = ResultCache(ttl_seconds=TABLE_CACHE_TTL, max_entries=TABLE_CACHE_MAX_ENTRIES)
+_token_cache = ResultCache(ttl_seconds=TOKEN_CACHE_TTL, max_entries=16)
+_thread_sessions = threading.local()
+_idle_worker_sessions: List[requests.Session] = []
+_idle_worker_sessions_lock = threading.Lock()
 
 REPORT_OVERVIEW_QUERY = """
 query($code: String!) {
@@ -99,14 +140,56 @@ class ReportMetadata:
     abilities: Dict[int, str]
 
 
+def create_session() -> requests.Session:
+    """
+    Build a ``requests.Session`` with a larger keep-alive pool and retries for transient API failures.
+
+    GraphQL reads are sent as POSTs, so POST is explicitly allowed to retry; the final failing
+    response is still returned so ``gql`` can surface the API's error detail.
+    """
+    retry = Retry(
+        total=HTTP_RETRY_TOTAL,
+        backoff_factor=HTTP_RETRY_BACKOFF,
+        status_forcelist=HTTP_RETRY_STATUSES,
+        allowed_methods=frozenset({"GET", "POST"}),
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE, max_retries=retry)
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def shared_session() -> requests.Session:
+    """
+    Return the calling thread's long-lived pooled session so consecutive summaries reuse warm connections.
+    """
+    session = getattr(_thread_sessions, "session", None)
+    if session is None:
+        session = create_session()
+        _thread_sessions.session = session
+    return session
+
+
 def get_token_from_client(
     client_id: Optional[str], client_secret: Optional[str], *, timeout: int = 30
 ) -> Optional[str]:
     """
     Exchange a client id/secret pair for a bearer token via the OAuth client credentials flow.
+
+    Issued tokens are reused for ``TOKEN_CACHE_TTL`` seconds (0 disables the cache), so back-to-back
+    summaries for the same credentials skip the OAuth round trip.
     """
     if not client_id or not client_secret:
         return None
+    cache_key: Optional[str] = None
+    if TOKEN_CACHE_TTL > 0:
+        secret_hash = hashlib.sha256(client_secret.encode("utf-8")).hexdigest()
+        cache_key = ResultCache.make_key("oauth_token", {"client_id": client_id, "secret": secret_hash})
+        cached = _token_cache.get(cache_key)
+        if cached is not None:
+            return cached
     try:
         resp = requests.post(
             OAUTH_URL,
@@ -118,15 +201,58 @@ def get_token_from_client(
             timeout=timeout,
         )
         resp.raise_for_status()
-        return resp.json().get("access_token")
+        access_token = resp.json().get("access_token")
     except Exception:
         return None
+    if access_token and cache_key is not None:
+        _token_cache.set(cache_key, access_token)
+    return access_token
+
+
+def clear_response_caches() -> None:
+    """
+    Drop every cached upstream response so the next fetch sees the live report.
+
+    Forced refreshes call this, since live logs keep gaining pulls and abilities within the cache TTL.
+    """
+    _gql_response_cache.clear()
+    _ability_name_cache.clear()
+    _table_cache.clear()
+
+
+def _gql_cache_key(token: str, query: str, variables: Dict[str, Any]) -> str:
+    token_hash = hashlib.sha256(token.encode("utf-8")).hexdigest()
+    return ResultCache.make_key("gql", {"query": query, "variables": variables, "token": token_hash})
+
+
+def _is_cacheable_query(query: str) -> bool:
+    # Event pages and tables can run to megabytes each; only report metadata is worth holding.
+    return "events(" not in query and "table(" not in query
+
+
+def _decode_json(content: bytes) -> Dict[str, Any]:
+    return _orjson.loads(content) if _orjson is not None else json.loads(content)
+
+
+def _encode_json(value: Any) -> bytes:
+    return _orjson.dumps(value) if _orjson is not None else json.dumps(value).encode("utf-8")
 
 
 def gql(session: requests.Session, token: str, query: str, variables: Dict[str, Any]) -> Dict[str, Any]:
     """
     Execute a GraphQL query against the Warcraft Logs API.
+
+    Successful metadata responses (fights, actors, abilities, player details) are cached for
+    ``GQL_CACHE_TTL`` seconds (0 disables the cache), so re-running an analysis on the same report
+    with different options skips those round trips. Event pages and tables are never retained. The
+    raw bytes are cached and decoded per call, which keeps callers free to mutate what they receive.
     """
+    cacheable = GQL_CACHE_TTL > 0 and _is_cacheable_query(query)
+    cache_key = _gql_cache_key(token, query, variables) if cacheable else None
+    if cache_key is not None:
+        cached = _gql_response_cache.get(cache_key)
+        if cached is not None:
+            return _decode_json(cached)["data"]
     headers = {"Authorization": f"Bearer {token}"}
     resp = session.post(API_URL, json={"query": query, "variables": variables}, headers=headers, timeout=60)
     try:
@@ -138,10 +264,13 @@ def gql(session: requests.Session, token: str, query: str, variables: Dict[str,
         except Exception:
             detail = resp.text
         raise requests.HTTPError(f"{exc} | Response: {detail}") from exc
-    data = resp.json()
+    content = resp.content
+    data = _decode_json(content)
     errors = data.get("errors")
     if errors:
         raise RuntimeError(f"GraphQL error(s): {errors}")
+    if cache_key is not None:
+        _gql_response_cache.set(cache_key, content)
     return data["data"]
 
 
@@ -205,9 +334,46 @@ def fetch_fights(session: requests.Session, token: str, code: str) -> Tuple[List
             )
         )
     actor_names, actor_classes, actor_owners = _build_actor_maps(report)
+    _ability_name_cache.set(_ability_name_cache_key(token, code), _build_ability_names(report))
     return fights, actor_names, actor_classes, actor_owners
 
 
+def _build_ability_names(report: Dict[str, Any]) -> Dict[int, str]:
+    abilities = (report.get("masterData") or {}).get("abilities") or []
+    names: Dict[int, str] = {}
+    for ability in abilities:
+        game_id = ability.get("gameID")
+        name = ability.get("name")
+        if game_id is None or not name:
+            continue
+        try:
+            names[int(game_id)] = str(name)
+        except (TypeError, ValueError):
+            continue
+    return names
+
+
+def _ability_name_cache_key(token: str, code: str) -> str:
+    token_hash = hashlib.sha256(token.encode("utf-8")).hexdigest()
+    return ResultCache.make_key("report_ability_names", {"code": code, "token": token_hash})
+
+
+def fetch_ability_names(session: requests.Session, token: str, code: str) -> Dict[int, str]:
+    """
+    Return the report's ability ID -> name map, reusing the overview already fetched by ``fetch_fights``.
+
+    Entries are keyed by report code and a hash of the bearer token, so a rotated token never
+    reads names cached under another credential. Callers receive a copy they may mutate.
+    """
+    key = _ability_name_cache_key(token, code)
+    cached = _ability_name_cache.get(key)
+    if cached is None:
+        overview = gql(session, token, REPORT_OVERVIEW_QUERY, {"code": code})
+        cached = _build_ability_names(overview["reportData"]["report"])
+        _ability_name_cache.set(key, cached)
+    return dict(cached)
+
+
 def _apply_actor_names(event: Dict[str, Any], actor_names: Dict[int, str]) -> None:
     """
     Mutate an event dict in-place to inject target/source names from actor metadata.
@@ -328,6 +494,88 @@ def fetch_events(
         time.sleep(sleep_seconds)
 
 
+@dataclass(frozen=True)
+class EventQuerySpec:
+    key: Hashable
+    data_type: str
+    start: float
+    end: float
+    ability_id: Optional[int] = None
+    extra_filter: Optional[str] = None
+    ability_name: Optional[str] = None
+
+
+def fetch_events_batched(
+    session: requests.Session,
+    token: str,
+    *,
+    code: str,
+    specs: Sequence[EventQuerySpec],
+    limit: int = 5000,
+    actor_names: Optional[Dict[int, str]] = None,
+    batch_size: int = EVENTS_BATCH_SIZE,
+    sleep_seconds: float = 0.1,
+) -> Dict[Hashable, List[Dict[str, Any]]]:
+    """
+    Fetch several event windows by aliasing them into shared GraphQL documents.
+
+    Each spec is paginated independently; specs that still have pages left are re-batched
+    with their advanced cursor until every window is exhausted.
+    """
+    results: Dict[Hashable, List[Dict[str, Any]]] = {spec.key: [] for spec in specs}
+    pending: List[Tuple[EventQuerySpec, float]] = [(spec, float(spec.start)) for spec in specs]
+    step = max(1, int(batch_size))
+    first_round = True
+
+    while pending:
+        if not first_round:
+            time.sleep(sleep_seconds)
+        first_round = False
+        next_pending: List[Tuple[EventQuerySpec, float]] = []
+        for offset in range(0, len(pending), step):
+            chunk = pending[offset : offset + step]
+            declarations = ["$code: String!", "$limit: Int!"]
+            fields: List[str] = []
+            variables: Dict[str, Any] = {"code": code, "limit": int(limit)}
+            for idx, (spec, cursor) in enumerate(chunk):
+                declarations.append(f"$dataType{idx}: EventDataType!, $start{idx}: Float!, $end{idx}: Float!, $filter{idx}: String")
+                fields.append(
+                    f"      e{idx}: events(dataType: $dataType{idx}, startTime: $start{idx}, endTime: $end{idx}, "
+                    f"limit: $limit, filterExpression: $filter{idx}) {{\n"
+                    "        data\n"
+                    "        nextPageTimestamp\n"
+                    "      }"
+                )
+                variables[f"dataType{idx}"] = spec.data_type
+                variables[f"start{idx}"] = float(cursor)
+                variables[f"end{idx}"] = float(spec.end)
+                variables[f"filter{idx}"] = _compose_filter_expression(
+                    ability_id=spec.ability_id, ability_name=spec.ability_name, extra_filter=spec.extra_filter
+                )
+            query = (
+                f"query({', '.join(declarations)}) {{\n"
+                "  reportData {\n"
+                "    report(code: $code) {\n"
+                + "\n".join(fields)
+                + "\n    }\n  }\n}\n"
+            )
+            payload = gql(session, token, query, variables)
+            report = payload["reportData"]["report"]
+            for idx, (spec, _) in enumerate(chunk):
+                events_data = report.get(f"e{idx}") or {}
+                rows = events_data.get("data") or []
+                if actor_names:
+                    for row in rows:
+                        _apply_actor_names(row, actor_names)
+                results[spec.key].extend(rows)
+                next_ts = events_data.get("nextPageTimestamp")
+                if next_ts is not None and next_ts < spec.end:
+                    next_pending.append((spec, float(next_ts + 1)))
+        pending = next_pending
+
+    return results
+
+
 def events_for_fights(
     session: requests.Session,
     token: str,
@@ -365,6 +613,65 @@ def events_for_fights(
             yield event
 
 
+def fetch_concurrently(
+    tasks: Mapping[_K, Callable[[requests.Session], _T]],
+    *,
+    max_workers: int = DEFAULT_FETCH_WORKERS,
+) -> Dict[_K, _T]:
+    """
+    Run independent fetch callables on a bounded thread pool and return results keyed like ``tasks``.
+
+    Each worker thread receives its own ``requests.Session`` since sessions are not safe to share
+    across concurrent requests. Sessions are returned to a small idle pool afterwards so later calls
+    reuse their warm keep-alive connections instead of repeating the TLS handshake.
+    """
+    if not tasks:
+        return {}
+    local = threading.local()
+    sessions: List[requests.Session] = []
+    sessions_lock = threading.Lock()
+
+    def run(task: Callable[[requests.Session], _T]) -> _T:
+        session = getattr(local, "session", None)
+        if session is None:
+            session = _acquire_worker_session()
+            local.session = session
+            with sessions_lock:
+                sessions.append(session)
+        return task(session)
+
+    workers = max(1, min(int(max_workers), len(tasks)))
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {key: executor.submit(run, task) for key, task in tasks.items()}
+            return {key: future.result() for key, future in futures.items()}
+    finally:
+        _release_worker_sessions(sessions)
+
+
+def _acquire_worker_session() -> requests.Session:
+    with _idle_worker_sessions_lock:
+        if _idle_worker_sessions:
+            return _idle_worker_sessions.pop()
+    return create_session()
+
+
+def _release_worker_sessions(sessions: List[requests.Session]) -> None:
+    overflow: List[requests.Session] = []
+    with _idle_worker_sessions_lock:
+        for session in sessions:
+            if len(_idle_worker_sessions) < IDLE_WORKER_SESSIONS_MAX:
+                _idle_worker_sessions.append(session)
+            else:
+                overflow.append(session)
+    for session in overflow:
+        session.close()
+
+
+def _unwrap_player_details(raw: Any) -> Dict[str, Any]:
+    return ((raw or {}).get("data") or {}).get("playerDetails") or {}
+
+
 def fetch_player_details(session: requests.Session, token: str, *, code: str, fight_ids: List[int]) -> Dict[str, Any]:
     """
     Retrieve the playerDetails JSON block for the given fights.
@@ -373,8 +680,81 @@ def fetch_player_details(session: requests.Session, token: str, *, code: str, fi
         return {}
     variables = {"code": code, "fightIDs": [int(fid) for fid in fight_ids]}
     payload = gql(session, token, PLAYER_DETAILS_QUERY, variables)
-    player_details = (((payload["reportData"]["report"].get("playerDetails") or {}).get("data") or {}).get("playerDetails") or {})
-    return player_details
+    return _unwrap_player_details(payload["reportData"]["report"].get("playerDetails"))
+
+
+def fetch_player_details_by_fight(
+    session: requests.Session,
+    token: str,
+    *,
+    code: str,
+    fight_ids: Iterable[int],
+    batch_size: int = PLAYER_DETAILS_BATCH_SIZE,
+) -> Dict[int, Dict[str, Any]]:
+    """
+    Retrieve one playerDetails block per fight, aliasing many fights into each GraphQL request.
+    """
+    _, details_by_fight = _fetch_player_details_aliased(
+        session, token, code=code, fight_ids=fight_ids, batch_size=batch_size, include_aggregate=False
+    )
+    return details_by_fight
+
+
+def fetch_player_details_breakdown(
+    session: requests.Session,
+    token: str,
+    *,
+    code: str,
+    fight_ids: Iterable[int],
+    batch_size: int = PLAYER_DETAILS_BATCH_SIZE,
+) -> Tuple[Dict[str, Any], Dict[int, Dict[str, Any]]]:
+    """
+    Retrieve the aggregated playerDetails block for all fights together with one block per fight.
+
+    The aggregate rides along in the first aliased request, so a typical report needs a single round-trip.
+    """
+    return _fetch_player_details_aliased(
+        session, token, code=code, fight_ids=fight_ids, batch_size=batch_size, include_aggregate=True
+    )
+
+
+def _fetch_player_details_aliased(
+    session: requests.Session,
+    token: str,
+    *,
+    code: str,
+    fight_ids: Iterable[int],
+    batch_size: int,
+    include_aggregate: bool,
+) -> Tuple[Dict[str, Any], Dict[int, Dict[str, Any]]]:
+    unique_ids = list(dict.fromkeys(int(fid) for fid in fight_ids))
+    step = max(1, int(batch_size))
+    aggregated: Dict[str, Any] = {}
+    details_by_fight: Dict[int, Dict[str, Any]] = {}
+    for offset in range(0, len(unique_ids), step):
+        chunk = unique_ids[offset : offset + step]
+        with_aggregate = include_aggregate and offset == 0
+        fields = [f"      fight{fid}: playerDetails(fightIDs: [{fid}])" for fid in chunk]
+        variables: Dict[str, Any] = {"code": code}
+        declarations = "$code: String!"
+        if with_aggregate:
+            fields.insert(0, "      aggregate: playerDetails(fightIDs: $fightIDs)")
+            variables["fightIDs"] = unique_ids
+            declarations += ", $fightIDs: [Int!]"
+        query = (
+            f"query({declarations}) {{\n"
+            "  reportData {\n"
+            "    report(code: $code) {\n"
+            + "\n".join(fields)
+            + "\n    }\n  }\n}\n"
+        )
+        payload = gql(session, token, query, variables)
+        report = payload["reportData"]["report"]
+        if with_aggregate:
+            aggregated = _unwrap_player_details(report.get("aggregate"))
+        for fid in chunk:
+            details_by_fight[fid] = _unwrap_player_details(report.get(f"fight{fid}"))
+    return aggregated, details_by_fight
 
 
 def fetch_table(
@@ -391,6 +771,10 @@ def fetch_table(
     """
     Fetch aggregated table data (Damage, Healing, etc.) for a specific fight.
     """
+    cache_key = _table_cache_key(token, code, data_type, fight_id, start, end, filter_expr)
+    cached = _table_cache.get(cache_key) if cache_key is not None else None
+    if cached is not None:
+        return _decode_json(cached)
     variables = {
         "code": code,
         "dataType": data_type,
@@ -401,5 +785,105 @@ def fetch_table(
     }
     payload = gql(session, token, TABLE_QUERY, variables)
     table = ((payload["reportData"]["report"].get("table") or {}).get("data") or {})
+    if cache_key is not None:
+        _table_cache.set(cache_key, _encode_json(table))
     return table
 
+
+def _table_cache_key(
+    token: str,
+    code: str,
+    data_type: str,
+    fight_id: int,
+    start: float,
+    end: float,
+    filter_expr: Optional[str],
+) -> Optional[str]:
+    if TABLE_CACHE_TTL <= 0:
+        return None
+    token_hash = hashlib.sha256(token.encode("utf-8")).hexdigest()
+    payload = {
+        "code": code,
+        "dataType": data_type,
+        "fightID": int(fight_id),
+        "start": float(start),
+        "end": float(end),
+        "filter": filter_expr,
+        "token": token_hash,
+    }
+    return ResultCache.make_key("table", payload)
+
+
+@dataclass(frozen=True)
+class TableQuerySpec:
+    key: Hashable
+    data_type: str
+    fight_id: int
+    start: float
+    end: float
+    filter_expr: Optional[str] = None
+
+
+def fetch_tables_batched(
+    session: requests.Session,
+    token: str,
+    *,
+    code: str,
+    specs: Sequence[TableQuerySpec],
+    batch_size: int = TABLES_BATCH_SIZE,
+) -> Dict[Hashable, Dict[str, Any]]:
+    """
+    Fetch several table windows by aliasing them into shared GraphQL documents.
+
+    Tables are small next to event pages, so each one is cached (encoded) for ``TABLE_CACHE_TTL`` seconds,
+    keyed by report, fight, data type, window and filter; only the uncached windows are requested.
+    """
+    results: Dict[Hashable, Dict[str, Any]] = {}
+    missing: List[Tuple[TableQuerySpec, Optional[str]]] = []
+    for spec in specs:
+        cache_key = _table_cache_key(
+            token, code, spec.data_type, spec.fight_id, spec.start, spec.end, spec.filter_expr
+        )
+        cached = _table_cache.get(cache_key) if cache_key is not None else None
+        if cached is not None:
+            results[spec.key] = _decode_json(cached)
+        else:
+            missing.append((spec, cache_key))
+    step = max(1, int(batch_size))
+    for offset in range(0, len(missing), step):
+        chunk = [spec for spec, _ in missing[offset : offset + step]]
+        chunk_keys = [cache_key for _, cache_key in missing[offset : offset + step]]
+        declarations = ["$code: String!"]
+        fields: List[str] = []
+        variables: Dict[str, Any] = {"code": code}
+        for idx, spec in enumerate(chunk):
+            declarations.append(
+                f"$dataType{idx}: TableDataType!, $fightIDs{idx}: [Int!], $start{idx}: Float!, "
+                f"$end{idx}: Float!, $filter{idx}: String"
+            )
+            fields.append(
+                f"      t{idx}: table(dataType: $dataType{idx}, fightIDs: $fightIDs{idx}, startTime: $start{idx}, "
+                f"endTime: $end{idx}, filterExpression: $filter{idx})"
+            )
+            variables[f"dataType{idx}"] = spec.data_type
+            variables[f"fightIDs{idx}"] = [int(spec.fight_id)]
+            variables[f"start{idx}"] = float(spec.start)
+            variables[f"end{idx}"] = float(spec.end)
+            variables[f"filter{idx}"] = spec.filter_expr
+        query = (
+            f"query({', '.join(declarations)}) {{\n"
+            "  reportData {\n"
+            "    report(code: $code) {\n"
+            + "\n".join(fields)
+            + "\n    }\n  }\n}\n"
+        )
+        payload = gql(session, token, query, variables)
+        report = payload["reportData"]["report"]
+        for idx, spec in enumerate(chunk):
+            table = (report.get(f"t{idx}") or {}).get("data") or {}
+            results[spec.key] = table
+            if chunk_keys[idx] is not None:
+                _table_cache.set(chunk_keys[idx], _encode_json(table))
+    # Cached windows were filled in first; hand results back in the order the specs were given.
+    return {spec.key: results[spec.key] for spec in specs}
+
@@ -18,8 +18,9 @@ class ResultCache:
     Store serialized job results for a short period to avoid redundant upstream calls.
     """
 
-    def __init__(self, ttl_seconds: float = DEFAULT_CACHE_TTL) -> None:
+    def __init__(self, ttl_seconds: float = DEFAULT_CACHE_TTL, max_entries: Optional[int] = None) -> None:
         self._ttl = ttl_seconds
+        self._max_entries = max_entries
         self._entries: Dict[str, tuple[float, Any]] = {}
         self._lock = threading.Lock()
 
@@ -46,12 +47,21 @@ class ResultCache:
     def set(self, key: str, value: Any) -> None:
         expires_at = time.time() + self._ttl
         with self._lock:
+            self._entries.pop(key, None)
             self._entries[key] = (expires_at, value)
+            if self._max_entries is not None:
+                # Dicts keep insertion order, so the first keys are the oldest writes.
+                while len(self._entries) > self._max_entries:
+                    self._entries.pop(next(iter(self._entries)))
 
     def invalidate(self, key: str) -> None:
         with self._lock:
             self._entries.pop(key, None)
 
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
     def set_ttl(self, ttl_seconds: float) -> None:
         with self._lock:
             self._ttl = ttl_seconds
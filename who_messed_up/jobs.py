@@ -11,6 +11,7 @@ from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Any, Callable, Dict, Optional, Tuple
 
+from .api import clear_response_caches
 from .cache import ResultCache, result_cache
 
 JobHandler = Callable[[Dict[str, Any]], Any]
@@ -162,6 +163,9 @@ class JobManager:
                 except ValueError:
                     pass
             try:
+                if job.bust_cache:
+                    # A forced refresh must not reuse upstream responses cached by an earlier run.
+                    clear_response_caches()
                 result = handler(job.payload)
                 job.result = result
                 job.status = "completed"
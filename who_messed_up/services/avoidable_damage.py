@@ -7,9 +7,7 @@ from collections import defaultdict
 from dataclasses import dataclass, field
 from typing import Callable, DefaultDict, Dict, Iterable, List, Optional, Set, Tuple
 
-import requests
-
-from ..api import fetch_events, fetch_fights, fetch_player_details
+from ..api import fetch_events, fetch_fights, fetch_player_details, shared_session
 from ..env import load_env
 from .ability_event_filters import collect_avoidable_exclusion_events, is_avoidable_event_excluded
 from .boss_manifest_types import (
@@ -190,7 +188,7 @@ def _fetch_single_avoidable_damage_summary(
 ) -> AvoidableDamageSummary:
     load_env()
 
-    session = requests.Session()
+    session = shared_session()
     bearer = _resolve_token(token, client_id, client_secret)
 
     fights, actor_names, actor_classes, _ = fetch_fights(session, bearer, report_code)
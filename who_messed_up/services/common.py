@@ -5,7 +5,7 @@ from __future__ import annotations
 
 from typing import Any, Dict, Iterable, List, Optional, Set, Tuple, Literal
 
-from ..api import Fight, filter_fights, get_token_from_client, fetch_events
+from ..api import EventQuerySpec, Fight, filter_fights, get_token_from_client, fetch_events_batched
 
 # Role/Spec metadata ---------------------------------------------------------
 
@@ -355,6 +355,33 @@ def _resolve_phase_labels(profile: Optional[str]) -> Dict[str, str]:
     return PHASE_LABEL_PRESETS[key]
 
 
+def _target_event_fields(event: Dict[str, Any]) -> Optional[Tuple[float, str, str]]:
+    """
+    Project an event onto ``(timestamp, target name, lowercased type)``, or ``None`` if it has no usable timestamp or target.
+    """
+    timestamp = event.get("timestamp")
+    if timestamp is None:
+        return None
+    # Warcraft Logs sends numeric timestamps; only other types need the guarded conversion.
+    timestamp_type = type(timestamp)
+    if timestamp_type is float:
+        ts_val = timestamp
+    elif timestamp_type is int:
+        ts_val = float(timestamp)
+    else:
+        try:
+            ts_val = float(timestamp)
+        except (TypeError, ValueError):
+            return None
+    target_name = event.get("targetName")
+    if not target_name:
+        target = event.get("target")
+        target_name = target.get("name") if isinstance(target, dict) else None
+        if not target_name:
+            return None
+    return ts_val, target_name, (event.get("type") or "").lower()
+
+
 def _extract_target_key(event: Dict[str, Any]) -> Optional[Tuple[Any, ...]]:
     target = event.get("target")
     guid = None
@@ -412,6 +439,67 @@ def _resolve_event_source_player(
     return resolved_name, resolved_id
 
 
+def fight_event_specs(
+    fights: Iterable[Fight],
+    queries: Iterable[Tuple[str, str, Optional[int]]],
+) -> List[EventQuerySpec]:
+    """
+    Expand ``(kind, data_type, ability_id)`` queries into one batched spec per fight, keyed by ``(kind, fight.id)``.
+    """
+    query_list = list(queries)
+    return [
+        EventQuerySpec(
+            key=(kind, fight.id),
+            data_type=data_type,
+            start=fight.start,
+            end=fight.end,
+            ability_id=ability_id,
+        )
+        for fight in fights
+        for kind, data_type, ability_id in query_list
+    ]
+
+
+def death_cutoff_from_events(events: Iterable[Dict[str, Any]], max_deaths: int) -> Optional[float]:
+    """
+    Return the timestamp of the ``max_deaths``-th death (or instakill) in a time-ordered Deaths stream.
+    """
+    total_deaths = 0
+    for event in events:
+        event_type = (event.get("type") or "").lower()
+        if event_type not in {"death", "instakill"}:
+            continue
+        timestamp = event.get("timestamp")
+        if timestamp is None:
+            continue
+        try:
+            ts_val = float(timestamp)
+        except (TypeError, ValueError):
+            continue
+        total_deaths += 1
+        if total_deaths >= max_deaths:
+            return ts_val
+    return None
+
+
+def death_cutoffs_from_events(
+    fights: Iterable[Fight],
+    events_by_fight: Dict[int, Iterable[Dict[str, Any]]],
+    max_deaths: Optional[int],
+) -> Dict[int, float]:
+    """
+    Apply ``death_cutoff_from_events`` to Deaths streams already fetched per fight id.
+    """
+    if not max_deaths or max_deaths <= 0:
+        return {}
+    cutoffs: Dict[int, float] = {}
+    for fight in fights:
+        cutoff_ts = death_cutoff_from_events(events_by_fight.get(fight.id, ()), max_deaths)
+        if cutoff_ts is not None:
+            cutoffs[fight.id] = cutoff_ts
+    return cutoffs
+
+
 def compute_death_cutoffs(
     session,
     bearer: str,
@@ -423,38 +511,22 @@ def compute_death_cutoffs(
 ) -> Dict[int, float]:
     """
     Determine the earliest timestamp per fight when ``max_deaths`` deaths have occurred.
+
+    Every fight's Deaths window is requested through one batched, aliased query.
     """
     if not max_deaths or max_deaths <= 0:
         return {}
-    cutoffs: Dict[int, float] = {}
-    for fight in fights:
-        total_deaths = 0
-        cutoff_ts: Optional[float] = None
-        for event in fetch_events(
-            session,
-            bearer,
-            code=report_code,
-            data_type="Deaths",
-            start=fight.start,
-            end=fight.end,
-            limit=1000,
-            actor_names=actor_names,
-        ):
-            event_type = (event.get("type") or "").lower()
-            if event_type not in {"death", "instakill"}:
-                continue
-            timestamp = event.get("timestamp")
-            if timestamp is None:
-                continue
-            try:
-                ts_val = float(timestamp)
-            except (TypeError, ValueError):
-                continue
-            total_deaths += 1
-            if total_deaths >= max_deaths:
-                cutoff_ts = ts_val
-                break
-        if cutoff_ts is not None:
-            cutoffs[fight.id] = cutoff_ts
-    return cutoffs
+    fight_list = list(fights)
+    fetched = fetch_events_batched(
+        session,
+        bearer,
+        code=report_code,
+        specs=[
+            EventQuerySpec(key=fight.id, data_type="Deaths", start=fight.start, end=fight.end)
+            for fight in fight_list
+        ],
+        limit=1000,
+        actor_names=actor_names,
+    )
+    return death_cutoffs_from_events(fight_list, fetched, max_deaths)
 
@@ -9,7 +9,7 @@ from typing import Any, DefaultDict, Dict, Iterable, List, Optional, Set, Tuple
 
 import requests
 
-from ..api import REPORT_OVERVIEW_QUERY, fetch_events, fetch_fights, fetch_player_details, gql
+from ..api import fetch_ability_names, fetch_events, fetch_fights, fetch_player_details, shared_session
 from ..env import load_env
 from .common import (
     ROLE_PRIORITY,
@@ -385,7 +385,7 @@ def _fetch_single_cooldown_usage_summary(
 ) -> CooldownUsageSummary:
     load_env()
 
-    session = requests.Session()
+    session = shared_session()
     bearer = _resolve_token(token, client_id, client_secret)
     fights, actor_names, actor_classes, actor_owners = fetch_fights(session, bearer, report_code)
     chosen = _select_fights(fights, name_filter=fight_name, fight_ids=fight_ids, difficulty=difficulty)
@@ -1275,17 +1275,7 @@ def _role_for_player_key(
 def _fetch_ability_labels(session: requests.Session, bearer: str, report_code: str) -> Dict[int, str]:
     labels: Dict[int, str] = {}
     try:
-        data = gql(session, bearer, REPORT_OVERVIEW_QUERY, {"code": report_code})
-        abilities = data["reportData"]["report"].get("masterData", {}).get("abilities", []) or []
-        for ability in abilities:
-            game_id = ability.get("gameID")
-            name = ability.get("name")
-            if game_id is None or not name:
-                continue
-            try:
-                labels[int(game_id)] = str(name)
-            except (TypeError, ValueError):
-                continue
+        labels.update(fetch_ability_names(session, bearer, report_code))
     except Exception:
         pass
     return labels
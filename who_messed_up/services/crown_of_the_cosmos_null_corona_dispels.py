@@ -15,7 +15,7 @@ from typing import DefaultDict, Dict, Iterable, List, Optional, Sequence, Set, T
 
 import requests
 
-from ..api import Fight, fetch_events, fetch_fights, fetch_player_details
+from ..api import Fight, fetch_events, fetch_fights, fetch_player_details, shared_session
 from ..env import load_env
 from .common import (
     ROLE_PRIORITY,
@@ -229,7 +229,7 @@ def _fetch_single_crown_null_corona_dispel_summary(
 ) -> CrownNullCoronaDispelSummary:
     load_env()
 
-    session = requests.Session()
+    session = shared_session()
     bearer = _resolve_token(token, client_id, client_secret)
     fights, actor_names, actor_classes, _ = fetch_fights(session, bearer, report_code)
     chosen = _select_fights(fights, name_filter=fight_name, fight_ids=fight_ids, difficulty=difficulty)
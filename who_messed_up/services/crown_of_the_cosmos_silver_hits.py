@@ -14,7 +14,7 @@ from typing import DefaultDict, Dict, Iterable, List, Optional, Set
 
 import requests
 
-from ..api import Fight, fetch_events, fetch_fights, fetch_player_details
+from ..api import Fight, fetch_events, fetch_fights, fetch_player_details, shared_session
 from ..env import load_env
 from .common import (
     ROLE_PRIORITY,
@@ -203,7 +203,7 @@ def _fetch_single_crown_silver_hit_summary(
 ) -> CrownSilverHitSummary:
     load_env()
 
-    session = requests.Session()
+    session = shared_session()
     bearer = _resolve_token(token, client_id, client_secret)
     fights, actor_names, actor_classes, _ = fetch_fights(session, bearer, report_code)
     known_players = {
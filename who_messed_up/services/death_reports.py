@@ -9,7 +9,7 @@ from typing import Any, DefaultDict, Dict, Iterable, List, Optional, Set, Tuple,
 
 import requests
 
-from ..api import REPORT_OVERVIEW_QUERY, fetch_events, fetch_fights, fetch_player_details, gql
+from ..api import fetch_ability_names, fetch_events, fetch_fights, fetch_player_details, shared_session
 from ..env import load_env
 from .ability_event_filters import collect_avoidable_exclusion_events, is_avoidable_event_excluded
 from .boss_manifest_types import BossAbilityMetadata, BossManifest, is_avoidable_for_role
@@ -191,7 +191,7 @@ def _fetch_single_death_report_summary(
 ) -> DeathReportSummary:
     load_env()
 
-    session = requests.Session()
+    session = shared_session()
     bearer = _resolve_token(token, client_id, client_secret)
 
     fights, actor_names, actor_classes, _ = fetch_fights(session, bearer, report_code)
@@ -211,7 +211,7 @@ def _fetch_single_death_report_summary(
             roles_by_fight[fight.id] = fight_roles
         participants = _players_from_details(details)
         participants_by_fight[fight.id] = participants
-        for name in set(participants):
+        for name in dict.fromkeys(participants):
             pulls_by_player[name] += 1
 
     death_limit = ignore_after_deaths if ignore_after_deaths and ignore_after_deaths > 0 else None
@@ -938,17 +938,7 @@ def _normalize_ability_id(raw: Optional[Union[int, str]]) -> Optional[int]:
 def _fetch_ability_labels(session, bearer: str, report_code: str) -> Dict[int, str]:
     labels: Dict[int, str] = {}
     try:
-        data = gql(session, bearer, REPORT_OVERVIEW_QUERY, {"code": report_code})
-        abilities = data["reportData"]["report"].get("masterData", {}).get("abilities", []) or []
-        for ability in abilities:
-            game_id = ability.get("gameID")
-            name = ability.get("name")
-            if game_id is None or not name:
-                continue
-            try:
-                labels[int(game_id)] = name
-            except (TypeError, ValueError):
-                continue
+        labels.update(fetch_ability_names(session, bearer, report_code))
     except Exception:
         pass
     return labels
@@ -7,9 +7,7 @@ from collections import defaultdict
 from dataclasses import dataclass
 from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
 
-import requests
-
-from ..api import fetch_events, fetch_fights, fetch_player_details
+from ..api import fetch_events, fetch_fights, fetch_player_details, shared_session
 from ..env import load_env
 from .common import (
     DIMENSIUS_INITIAL_ADD_IGNORE_COUNT,
@@ -70,7 +68,7 @@ def _fetch_dimensius_add_damage_single(
 
     fight_id_filter = [int(fid) for fid in fight_ids] if fight_ids else None
 
-    session = requests.Session()
+    session = shared_session()
     bearer = _resolve_token(token, client_id, client_secret)
     fights, actor_names, actor_classes, actor_owners = fetch_fights(session, bearer, report_code)
     chosen = _select_fights(fights, name_filter=fight_name, fight_ids=fight_id_filter, difficulty=difficulty)
@@ -6,9 +6,7 @@ from __future__ import annotations
 from collections import defaultdict
 from typing import DefaultDict, Dict, Iterable, List, Optional
 
-import requests
-
-from ..api import Fight, fetch_fights, fetch_player_details
+from ..api import Fight, fetch_fights, fetch_player_details, shared_session
 from ..env import load_env
 from .common import (
     ROLE_PRIORITY,
@@ -51,7 +49,7 @@ def fetch_dimensius_bled_out_summary(
 ) -> DimensiusDeathSummary:
     load_env()
 
-    session = requests.Session()
+    session = shared_session()
     bearer = _resolve_token(token, client_id, client_secret)
 
     fights, actor_names, actor_classes, _ = fetch_fights(session, bearer, report_code)
@@ -71,7 +69,7 @@ def fetch_dimensius_bled_out_summary(
             roles_by_fight[fight.id] = fight_roles
         participants = _players_from_details(details)
         participants_by_fight[fight.id] = participants
-        for name in set(participants):
+        for name in dict.fromkeys(participants):
             pulls_by_player[name] += 1
 
     death_limit = ignore_after_deaths if ignore_after_deaths and ignore_after_deaths > 0 else None
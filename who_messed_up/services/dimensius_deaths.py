@@ -6,12 +6,20 @@ from __future__ import annotations
 from bisect import bisect_left
 from collections import defaultdict
 from dataclasses import dataclass, field
-from typing import Any, DefaultDict, Dict, Iterable, List, Optional, Tuple, Set, Union
+from operator import attrgetter
+from typing import Any, Callable, DefaultDict, Dict, Iterable, List, Optional, Tuple, Set, Union
 
 import requests
 
 from ..env import load_env
-from ..api import Fight, fetch_events, fetch_fights, fetch_player_details, REPORT_OVERVIEW_QUERY, gql
+from ..api import (
+    fetch_ability_names,
+    fetch_concurrently,
+    fetch_events_batched,
+    fetch_fights,
+    fetch_player_details_breakdown,
+    shared_session,
+)
 from .common import (
     ROLE_PRIORITY,
     ROLE_UNKNOWN,
@@ -19,8 +27,10 @@ from .common import (
     _players_from_details,
     _resolve_token,
     _select_fights,
-    compute_death_cutoffs,
+    _target_event_fields,
     compute_fight_duration_ms,
+    death_cutoffs_from_events,
+    fight_event_specs,
 )
 from .consumables import (
     DEATH_REPORT_HEALING_CONSUMABLES,
@@ -41,6 +51,13 @@ FISTS_OF_VOIDLORD_ID = 1227665
 DEVOUR_ID = 1243373
 RECENT_WINDOW_MS = 8000.0
 
+_FIGHT_EVENT_QUERIES: Tuple[Tuple[str, str, Optional[int]], ...] = (
+    ("airborne", "Debuffs", AIRBORNE_ID),
+    ("fists", "DamageTaken", FISTS_OF_VOIDLORD_ID),
+    ("devour", "DamageTaken", DEVOUR_ID),
+    ("deaths", "Deaths", None),
+)
+
 OBLIVION_FILTER_INCLUDE_ALL = "include_all"
 OBLIVION_FILTER_EXCLUDE_WITHOUT_RECENT = "exclude_without_recent"
 OBLIVION_FILTER_EXCLUDE_ALL = "exclude_all"
@@ -59,7 +76,7 @@ ABILITY_LABELS: Dict[int, str] = {
 }
 
 
-@dataclass
+@dataclass(slots=True)
 class DimensiusDeathEvent:
     player: str
     fight_id: int
@@ -77,7 +94,7 @@ class DimensiusDeathEvent:
     pull_duration_ms: Optional[float] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class DimensiusDeathEntry:
     player: str
     role: str
@@ -88,7 +105,7 @@ class DimensiusDeathEntry:
     events: List[DimensiusDeathEvent]
 
 
-@dataclass
+@dataclass(slots=True)
 class DimensiusDeathSummary:
     report_code: str
     fight_filter: Optional[str]
@@ -121,83 +138,97 @@ def fetch_dimensius_death_summary(
 ) -> DimensiusDeathSummary:
     load_env()
 
-    session = requests.Session()
+    session = shared_session()
     bearer = _resolve_token(token, client_id, client_secret)
 
     fights, actor_names, actor_classes, _ = fetch_fights(session, bearer, report_code)
     chosen = _select_fights(fights, name_filter=fight_name, fight_ids=fight_ids, difficulty=difficulty)
     fight_id_list = [fight.id for fight in chosen]
 
-    aggregated_details = fetch_player_details(session, bearer, code=report_code, fight_ids=fight_id_list)
+    death_limit = ignore_after_deaths if ignore_after_deaths and ignore_after_deaths > 0 else None
+    consumable_names = [consumable.ability_name for consumable in DEATH_REPORT_HEALING_CONSUMABLES]
+    stage_tasks: Dict[str, Callable[[requests.Session], Any]] = {
+        "details": lambda worker: fetch_player_details_breakdown(
+            worker, bearer, code=report_code, fight_ids=fight_id_list
+        ),
+        "events": lambda worker: fetch_events_batched(
+            worker,
+            bearer,
+            code=report_code,
+            specs=fight_event_specs(chosen, _FIGHT_EVENT_QUERIES),
+            actor_names=actor_names,
+        ),
+        "consumables": lambda worker: collect_healing_consumable_uses(
+            worker,
+            bearer,
+            fights=chosen,
+            report_code=report_code,
+            ability_names=consumable_names,
+            actor_names=actor_names,
+        ),
+    }
+    staged = fetch_concurrently(stage_tasks)
+    aggregated_details, details_by_fight = staged["details"]
+    fetched = staged["events"]
+    # The batch already carries every fight's Deaths window, so the cutoffs come from it directly.
+    death_cutoffs = death_cutoffs_from_events(
+        chosen, {fight.id: fetched[("deaths", fight.id)] for fight in chosen}, death_limit
+    )
+    consumable_usage_by_fight = staged["consumables"]
     player_roles, player_specs = _infer_player_roles(aggregated_details)
 
     pulls_by_player: DefaultDict[str, int] = defaultdict(int)
     roles_by_fight: Dict[int, Dict[str, str]] = {}
     participants_by_fight: Dict[int, List[str]] = {}
     for fight in chosen:
-        details = fetch_player_details(session, bearer, code=report_code, fight_ids=[fight.id])
+        details = details_by_fight.get(fight.id, {})
         fight_roles, _ = _infer_player_roles(details)
         if fight_roles:
             roles_by_fight[fight.id] = fight_roles
         participants = _players_from_details(details)
         participants_by_fight[fight.id] = participants
-        for name in set(participants):
+        for name in dict.fromkeys(participants):
             pulls_by_player[name] += 1
 
-    death_limit = ignore_after_deaths if ignore_after_deaths and ignore_after_deaths > 0 else None
-    death_cutoffs = compute_death_cutoffs(
-        session,
-        bearer,
-        fights=chosen,
-        report_code=report_code,
-        actor_names=actor_names,
-        max_deaths=death_limit,
-    )
-
     pull_index_by_fight: Dict[int, int] = {fight.id: idx + 1 for idx, fight in enumerate(chosen)}
-    airborne_events = _collect_target_event_times(
-        session,
-        bearer,
-        fights=chosen,
-        report_code=report_code,
-        data_type="Debuffs",
-        ability_id=AIRBORNE_ID,
-        actor_names=actor_names,
+    airborne_times = _collect_target_event_times(
+        {fight.id: fetched[("airborne", fight.id)] for fight in chosen},
         allowed_types={"applydebuff", "applydebuffstack", "refreshdebuff"},
         death_cutoffs=death_cutoffs,
     )
-    fists_events = _collect_target_event_times(
-        session,
-        bearer,
-        fights=chosen,
-        report_code=report_code,
-        data_type="DamageTaken",
-        ability_id=FISTS_OF_VOIDLORD_ID,
-        actor_names=actor_names,
+    fists_times = _collect_target_event_times(
+        {fight.id: fetched[("fists", fight.id)] for fight in chosen},
         death_cutoffs=death_cutoffs,
     )
-    devour_events = _collect_target_event_times(
-        session,
-        bearer,
-        fights=chosen,
-        report_code=report_code,
-        data_type="DamageTaken",
-        ability_id=DEVOUR_ID,
-        actor_names=actor_names,
+    devour_times = _collect_target_event_times(
+        {fight.id: fetched[("devour", fight.id)] for fight in chosen},
         death_cutoffs=death_cutoffs,
     )
+    trigger_keys: Set[Tuple[int, str]] = {
+        key for times in (airborne_times, fists_times, devour_times) for key, timestamps in times.items() if timestamps
+    }
+    airborne_events = RecentEventProbe(airborne_times)
+    fists_events = RecentEventProbe(fists_times)
+    devour_events = RecentEventProbe(devour_times)
 
     events_by_player: DefaultDict[str, List[DimensiusDeathEvent]] = defaultdict(list)
-    death_counts: DefaultDict[str, int] = defaultdict(int)
     ability_labels = _fetch_ability_labels(session, bearer, report_code)
     oblivion_filter_mode = _normalize_oblivion_filter(oblivion_filter)
-    consumable_usage_by_fight = collect_healing_consumable_uses(
-        session,
-        bearer,
-        fights=chosen,
-        report_code=report_code,
-        ability_names=[consumable.ability_name for consumable in DEATH_REPORT_HEALING_CONSUMABLES],
-        actor_names=actor_names,
+    recent_hits_by_fight = fetch_concurrently(
+        {
+            fight.id: (
+                lambda worker, fight=fight: collect_recent_damage_hits(
+                    worker,
+                    bearer,
+                    report_code=report_code,
+                    fight=fight,
+                    actor_names=actor_names,
+                    ability_labels=ability_labels,
+                    player_roles=roles_by_fight.get(fight.id, player_roles),
+                )
+            )
+            for fight in chosen
+        }
     )
 
     for fight in chosen:
@@ -205,39 +236,18 @@ def fetch_dimensius_death_summary(
         cutoff = death_cutoffs.get(fight.id) if death_cutoffs else None
         fight_consumables = consumable_usage_by_fight.get(fight.id, {})
         fight_roles = roles_by_fight.get(fight.id, player_roles)
-        recent_damage_hits = collect_recent_damage_hits(
-            session,
-            bearer,
-            report_code=report_code,
-            fight=fight,
-            actor_names=actor_names,
-            ability_labels=ability_labels,
-            player_roles=fight_roles,
-        )
+        fight_start = float(fight.start)
+        fight_label = fight.name or ""
+        pull_index = pull_index_by_fight.get(fight.id, 0)
+        recent_damage_hits = recent_hits_by_fight[fight.id]
         counted_deaths = 0
-        for event in fetch_events(
-            session,
-            bearer,
-            code=report_code,
-            data_type="Deaths",
-            start=fight.start,
-            end=fight.end,
-            actor_names=actor_names,
-        ):
-            timestamp = event.get("timestamp")
-            if timestamp is None:
-                continue
-            try:
-                ts_val = float(timestamp)
-            except (TypeError, ValueError):
+        for event in fetched[("deaths", fight.id)]:
+            fields = _target_event_fields(event)
+            if fields is None:
                 continue
+            ts_val, target_name, _ = fields
             if cutoff is not None and ts_val > cutoff:
                 continue
-            target_name = event.get("targetName")
-            if not target_name and isinstance(event.get("target"), dict):
-                target_name = event["target"].get("name")
-            if not target_name:
-                continue
             if death_limit is not None:
                 counted_deaths += 1
                 if counted_deaths > death_limit:
@@ -250,6 +260,7 @@ def fetch_dimensius_death_summary(
                     fight_id=fight.id,
                     player=target_name,
                     timestamp=ts_val,
+                    trigger_keys=trigger_keys,
                     airborne_events=airborne_events,
                     fists_events=fists_events,
                     devour_events=devour_events,
@@ -257,7 +268,7 @@ def fetch_dimensius_death_summary(
             if not include_death:
                 continue
             killing_damage = resolve_killing_damage(event)
-            offset_ms = ts_val - float(fight.start)
+            offset_ms = ts_val - fight_start
             recent_hits = recent_hits_for_death(
                 recent_damage_hits.get(target_name, []),
                 death_timestamp=ts_val,
@@ -268,13 +279,12 @@ def fetch_dimensius_death_summary(
                 source_report_code=report_code,
                 player_role=fight_roles.get(target_name) or player_roles.get(target_name),
             )
-            death_counts[target_name] += 1
             events_by_player[target_name].append(
                 DimensiusDeathEvent(
                     player=target_name,
                     fight_id=fight.id,
-                    fight_name=fight.name or "",
-                    pull_index=pull_index_by_fight.get(fight.id, 0),
+                    fight_name=fight_label,
+                    pull_index=pull_index,
                     timestamp=ts_val,
                     offset_ms=offset_ms,
                     ability_id=int(ability_id) if ability_id is not None else None,
@@ -297,6 +307,7 @@ def fetch_dimensius_death_summary(
         if name:
             name_to_class[name] = actor_classes.get(actor_id)
 
+    death_counts: Dict[str, int] = {player: len(events) for player, events in events_by_player.items()}
     all_players = set(pulls_by_player.keys()) | set(events_by_player.keys())
     if not all_players and participants_by_fight:
         for participants in participants_by_fight.values():
@@ -304,13 +315,14 @@ def fetch_dimensius_death_summary(
 
     entries: List[DimensiusDeathEntry] = []
     total_deaths = 0
+    name_lower = {player: player.lower() for player in all_players}
 
     for player in sorted(
         all_players,
         key=lambda name: (
             ROLE_PRIORITY.get(player_roles.get(name, ROLE_UNKNOWN), ROLE_PRIORITY[ROLE_UNKNOWN]),
             -death_counts.get(name, 0),
-            name.lower(),
+            name_lower[name],
         ),
     ):
         pulls = pulls_by_player.get(player, pull_count)
@@ -327,7 +339,7 @@ def fetch_dimensius_death_summary(
                 pulls=pulls,
                 deaths=deaths,
                 death_rate=death_rate,
-                events=sorted(events_by_player.get(player, []), key=lambda evt: evt.timestamp),
+                events=sorted(events_by_player.get(player, []), key=attrgetter("timestamp")),
             )
     )
 
@@ -343,7 +355,7 @@ def fetch_dimensius_death_summary(
         player_classes={player: name_to_class.get(player) for player in all_players},
         player_roles={player: player_roles.get(player, ROLE_UNKNOWN) for player in all_players},
         player_specs={player: player_specs.get(player) for player in all_players},
-        player_events={player: list(events) for player, events in events_by_player.items()},
+        player_events={entry.player: entry.events for entry in entries if entry.events},
         ability_labels=ability_labels,
     )
 
@@ -356,23 +368,55 @@ def _normalize_oblivion_filter(value: Optional[str]) -> str:
     return OBLIVION_FILTER_DEFAULT
 
 
+class RecentEventProbe:
+    """
+    Answer "did this player have an event in the window before ``timestamp``?" against sorted per-target timelines.
+
+    Deaths are probed in timestamp order within a fight, so the bisect lower bound from the previous
+    probe for the same key is reused; an out-of-order probe simply falls back to a full bisect.
+    """
+
+    def __init__(self, events_by_target: Dict[Tuple[int, str], List[float]], window_ms: float = RECENT_WINDOW_MS) -> None:
+        self._events_by_target = events_by_target
+        self._window_ms = window_ms
+        self._lower_bounds: Dict[Tuple[int, str], int] = {}
+
+    def has_recent(self, key: Tuple[int, str], timestamp: float) -> bool:
+        timestamps = self._events_by_target.get(key)
+        if not timestamps:
+            return False
+        cutoff = timestamp - self._window_ms
+        if timestamps[-1] < cutoff:
+            return False
+        lo = self._lower_bounds.get(key, 0)
+        if lo and timestamps[lo - 1] >= cutoff:
+            lo = 0
+        idx = bisect_left(timestamps, cutoff, lo)
+        self._lower_bounds[key] = idx
+        return idx < len(timestamps) and timestamps[idx] <= timestamp
+
+
 def _should_include_oblivion_death(
     mode: str,
     *,
     fight_id: int,
     player: str,
     timestamp: float,
-    airborne_events: Dict[int, Dict[str, List[float]]],
-    fists_events: Dict[int, Dict[str, List[float]]],
-    devour_events: Dict[int, Dict[str, List[float]]],
+    trigger_keys: Set[Tuple[int, str]],
+    airborne_events: RecentEventProbe,
+    fists_events: RecentEventProbe,
+    devour_events: RecentEventProbe,
 ) -> bool:
     if mode == OBLIVION_FILTER_EXCLUDE_ALL:
         return False
     if mode == OBLIVION_FILTER_EXCLUDE_WITHOUT_RECENT:
+        key = (fight_id, player)
+        if key not in trigger_keys:
+            return False
         return (
-            _has_recent_event(airborne_events, fight_id, player, timestamp)
-            or _has_recent_event(fists_events, fight_id, player, timestamp)
-            or _has_recent_event(devour_events, fight_id, player, timestamp)
+            airborne_events.has_recent(key, timestamp)
+            or fists_events.has_recent(key, timestamp)
+            or devour_events.has_recent(key, timestamp)
         )
     return True
 
@@ -411,87 +455,34 @@ def _normalize_ability_id(raw: Optional[Union[int, str]]) -> Optional[int]:
 
 
 def _collect_target_event_times(
-    session: requests.Session,
-    bearer: str,
+    fight_events: Dict[int, Iterable[Dict[str, Any]]],
     *,
-    fights: Iterable[Fight],
-    report_code: str,
-    data_type: str,
-    ability_id: int,
-    actor_names: Dict[int, str],
     allowed_types: Optional[Set[str]] = None,
     death_cutoffs: Optional[Dict[int, float]] = None,
-) -> Dict[int, Dict[str, List[float]]]:
-    events_by_fight: Dict[int, Dict[str, List[float]]] = defaultdict(lambda: defaultdict(list))
-    for fight in fights:
-        cutoff = death_cutoffs.get(fight.id) if death_cutoffs else None
-        for event in fetch_events(
-            session,
-            bearer,
-            code=report_code,
-            data_type=data_type,
-            start=fight.start,
-            end=fight.end,
-            ability_id=ability_id,
-            actor_names=actor_names,
-        ):
-            if allowed_types:
-                event_type = (event.get("type") or "").lower()
-                if event_type not in allowed_types:
-                    continue
-            timestamp = event.get("timestamp")
-            if timestamp is None:
-                continue
-            try:
-                ts_val = float(timestamp)
-            except (TypeError, ValueError):
-                continue
-            if cutoff is not None and ts_val >= cutoff:
+) -> Dict[Tuple[int, str], List[float]]:
+    events_by_target: Dict[Tuple[int, str], List[float]] = {}
+    for fight_id, events in fight_events.items():
+        for event in events:
+            fields = _target_event_fields(event)
+            if fields is None:
                 continue
-            target_name = event.get("targetName")
-            if not target_name and isinstance(event.get("target"), dict):
-                target_name = event["target"].get("name")
-            if not target_name:
+            ts_val, target_name, event_type = fields
+            if allowed_types and event_type not in allowed_types:
                 continue
-            events_by_fight[fight.id][target_name].append(ts_val)
-    for fight_map in events_by_fight.values():
-        for timestamps in fight_map.values():
-            timestamps.sort()
-    return events_by_fight
-
-
-def _has_recent_event(
-    events_by_fight: Dict[int, Dict[str, List[float]]],
-    fight_id: int,
-    player: str,
-    timestamp: float,
-    window_ms: float = RECENT_WINDOW_MS,
-) -> bool:
-    fight_events = events_by_fight.get(fight_id)
-    if not fight_events:
-        return False
-    timestamps = fight_events.get(player)
-    if not timestamps:
-        return False
-    cutoff = timestamp - window_ms
-    idx = bisect_left(timestamps, cutoff)
-    return idx < len(timestamps) and timestamps[idx] <= timestamp
+            events_by_target.setdefault((fight_id, target_name), []).append(ts_val)
+    # Apply death cutoffs per timeline after sorting: one bisect + slice delete instead of a compare per event.
+    for (fight_id, _), timestamps in events_by_target.items():
+        timestamps.sort()
+        cutoff = death_cutoffs.get(fight_id) if death_cutoffs else None
+        if cutoff is not None:
+            del timestamps[bisect_left(timestamps, cutoff) :]
+    return events_by_target
 
 
 def _fetch_ability_labels(session, bearer: str, report_code: str) -> Dict[int, str]:
     labels = dict(ABILITY_LABELS)
     try:
-        data = gql(session, bearer, REPORT_OVERVIEW_QUERY, {"code": report_code})
-        abilities = data["reportData"]["report"].get("masterData", {}).get("abilities", []) or []
-        for ability in abilities:
-            game_id = ability.get("gameID")
-            name = ability.get("name")
-            if game_id is None or not name:
-                continue
-            try:
-                labels[int(game_id)] = name
-            except (TypeError, ValueError):
-                continue
+        labels.update(fetch_ability_names(session, bearer, report_code))
     except Exception:
         pass
     return labels
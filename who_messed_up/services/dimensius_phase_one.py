@@ -3,14 +3,17 @@ Dimensius Phase One analysis helpers (Reverse Gravity + Excess Mass overlaps).
 """
 from __future__ import annotations
 
-from collections import defaultdict
+import heapq
+from bisect import bisect_right
+from collections import Counter, defaultdict
 from dataclasses import dataclass
-from typing import DefaultDict, Dict, Iterable, List, Optional, Tuple, Set
+from operator import itemgetter
+from typing import Any, Callable, DefaultDict, Dict, Iterable, Iterator, List, Optional, Tuple, Set
 
 import requests
 
 from ..env import load_env
-from ..api import Fight, fetch_events, fetch_fights, fetch_player_details
+from ..api import Fight, fetch_concurrently, fetch_events_batched, fetch_fights, fetch_player_details_breakdown, shared_session
 from .common import (
     ROLE_PRIORITY,
     ROLE_UNKNOWN,
@@ -18,8 +21,10 @@ from .common import (
     _players_from_details,
     _resolve_token,
     _select_fights,
-    compute_death_cutoffs,
+    _target_event_fields,
     compute_fight_duration_ms,
+    death_cutoffs_from_events,
+    fight_event_specs,
 )
 
 REVERSE_GRAVITY_ID = 1243577
@@ -35,20 +40,20 @@ EARLY_MASS_WINDOW_MAX_SECONDS = 15
 REVERSE_GRAVITY_SET_GAP_MS = 1500.0
 
 
-@dataclass
+@dataclass(slots=True)
 class MetricDefinition:
     id: str
     label: str
     per_pull_label: str
 
 
-@dataclass
+@dataclass(slots=True)
 class MetricValue:
     total: float
     per_pull: float
 
 
-@dataclass
+@dataclass(slots=True)
 class TrackedEvent:
     player: str
     fight_id: int
@@ -60,7 +65,7 @@ class TrackedEvent:
     pull_duration_ms: Optional[float] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class DimensiusPhaseOneEntry:
     player: str
     role: str
@@ -71,7 +76,7 @@ class DimensiusPhaseOneEntry:
     events: List[TrackedEvent]
 
 
-@dataclass
+@dataclass(slots=True)
 class DimensiusPhaseOneSummary:
     report_code: str
     fight_filter: Optional[str]
@@ -106,27 +111,56 @@ def fetch_dimensius_phase_one_summary(
 ) -> DimensiusPhaseOneSummary:
     load_env()
 
-    session = requests.Session()
+    session = shared_session()
     bearer = _resolve_token(token, client_id, client_secret)
 
     fights, actor_names, actor_classes, _ = fetch_fights(session, bearer, report_code)
     chosen = _select_fights(fights, name_filter=fight_name, fight_ids=fight_ids)
     fight_id_list = [fight.id for fight in chosen]
 
-    aggregated_details = fetch_player_details(session, bearer, code=report_code, fight_ids=fight_id_list)
+    # Reverse Gravity / Excess Mass debuffs only feed the overlap and early-mass metrics.
+    need_debuffs = include_rg_em_overlap or include_early_mass
+    event_queries: List[Tuple[str, str, Optional[int]]] = []
+    if need_debuffs:
+        event_queries.append(("reverse_gravity", "Debuffs", REVERSE_GRAVITY_ID))
+        event_queries.append(("excess_mass", "Debuffs", EXCESS_MASS_ID))
+    if include_dark_energy_hits:
+        event_queries.append(("dark_energy", "DamageTaken", DARK_ENERGY_ID))
+    death_limit = ignore_after_deaths if ignore_after_deaths and ignore_after_deaths > 0 else None
+    # Deaths ride along in the same batched requests when a cutoff is needed.
+    if death_limit is not None:
+        event_queries.append(("deaths", "Deaths", None))
+    stage_tasks: Dict[str, Callable[[requests.Session], Any]] = {
+        "details": lambda worker: fetch_player_details_breakdown(
+            worker, bearer, code=report_code, fight_ids=fight_id_list
+        ),
+        "events": lambda worker: fetch_events_batched(
+            worker,
+            bearer,
+            code=report_code,
+            specs=fight_event_specs(chosen, event_queries),
+            actor_names=actor_names,
+        ),
+    }
+    staged = fetch_concurrently(stage_tasks)
+    aggregated_details, details_by_fight = staged["details"]
+    fetched = staged["events"]
+    death_cutoffs = death_cutoffs_from_events(
+        chosen,
+        {fight.id: fetched.get(("deaths", fight.id), ()) for fight in chosen},
+        death_limit,
+    )
     player_roles, player_specs = _infer_player_roles(aggregated_details)
+    rg_events_by_fight = {fight.id: fetched.get(("reverse_gravity", fight.id), []) for fight in chosen}
+    em_events_by_fight = {fight.id: fetched.get(("excess_mass", fight.id), []) for fight in chosen}
 
     pulls_by_player: DefaultDict[str, int] = defaultdict(int)
-    roles_by_fight: Dict[int, Dict[str, str]] = {}
     participants_by_fight: Dict[int, List[str]] = {}
     for fight in chosen:
-        details = fetch_player_details(session, bearer, code=report_code, fight_ids=[fight.id])
-        fight_roles, _ = _infer_player_roles(details)
-        if fight_roles:
-            roles_by_fight[fight.id] = fight_roles
+        details = details_by_fight.get(fight.id, {})
         participants = _players_from_details(details)
         participants_by_fight[fight.id] = participants
-        for name in set(participants):
+        for name in dict.fromkeys(participants):
             pulls_by_player[name] += 1
 
     metrics: List[MetricDefinition] = []
@@ -155,151 +189,92 @@ def fetch_dimensius_phase_one_summary(
             )
         )
 
-    death_limit = ignore_after_deaths if ignore_after_deaths and ignore_after_deaths > 0 else None
-    death_cutoffs = compute_death_cutoffs(
-        session,
-        bearer,
-        fights=chosen,
-        report_code=report_code,
-        actor_names=actor_names,
-        max_deaths=death_limit,
-    )
-
-    overlap_counts_by_player: DefaultDict[str, int] = defaultdict(int)
     player_events: DefaultDict[str, List[TrackedEvent]] = defaultdict(list)
-    pull_index_by_fight: Dict[int, int] = {fight.id: idx + 1 for idx, fight in enumerate(chosen)}
-    early_mass_counts_by_player: DefaultDict[str, int] = defaultdict(int)
-    dark_energy_counts_by_player: DefaultDict[str, int] = defaultdict(int)
+    # (start, duration, label, pull index) per fight, shared by every metric's TrackedEvent records.
+    fight_meta: Dict[int, Tuple[float, Optional[float], str, int]] = {
+        fight.id: (float(fight.start), compute_fight_duration_ms(fight), fight.name or "", idx)
+        for idx, fight in enumerate(chosen, start=1)
+    }
     early_mass_window_value: Optional[int] = None
     early_mass_window_ms = EARLY_MASS_WINDOW_MS
     if include_early_mass:
         early_mass_window_value, early_mass_window_ms = _normalize_early_mass_window(early_mass_window_seconds)
 
+    overlap_starts_by_fight: Dict[int, List[Tuple[float, str]]] = {}
     if include_rg_em_overlap:
-        rg_intervals, rg_apply_events = _collect_debuff_intervals(
-            session,
-            bearer,
-            fights=chosen,
-            report_code=report_code,
-            ability_id=REVERSE_GRAVITY_ID,
-            actor_names=actor_names,
-            capture_applies=True,
-            death_cutoffs=death_cutoffs,
-        )
-        em_intervals, _ = _collect_debuff_intervals(
-            session,
-            bearer,
-            fights=chosen,
-            report_code=report_code,
-            ability_id=EXCESS_MASS_ID,
-            actor_names=actor_names,
+        overlap_starts_by_fight = _collect_overlap_starts(
+            chosen,
+            rg_events_by_fight,
+            em_events_by_fight,
             death_cutoffs=death_cutoffs,
         )
-        for fight in chosen:
-            pull_duration = compute_fight_duration_ms(fight)
-            fight_rg = rg_intervals.get(fight.id, {})
-            fight_em = em_intervals.get(fight.id, {})
-            players = set(fight_rg.keys()) | set(fight_em.keys())
-            for player in players:
-                overlaps = _detect_interval_overlaps(fight_rg.get(player, []), fight_em.get(player, []))
-                if overlaps:
-                    overlap_counts_by_player[player] += len(overlaps)
-                    for overlap_ts in overlaps:
-                        offset = overlap_ts - float(fight.start)
-                        player_events[player].append(
-                            TrackedEvent(
-                                player=player,
-                                fight_id=fight.id,
-                                fight_name=fight.name or "",
-                                pull_index=pull_index_by_fight.get(fight.id, 0),
-                                timestamp=overlap_ts,
-                                offset_ms=offset,
-                                metric_id="rg_em_overlap",
-                                pull_duration_ms=pull_duration,
-                            )
-                        )
-    else:
-        rg_intervals, rg_apply_events = _collect_debuff_intervals(
-            session,
-            bearer,
-            fights=chosen,
-            report_code=report_code,
-            ability_id=REVERSE_GRAVITY_ID,
-            actor_names=actor_names,
+    em_intervals: Dict[int, Dict[str, List[Tuple[float, float]]]] = {}
+    set_starts_by_fight: Dict[int, List[float]] = {}
+    if include_early_mass:
+        _, rg_apply_events = _collect_debuff_intervals(
+            chosen,
+            rg_events_by_fight,
             capture_applies=True,
             death_cutoffs=death_cutoffs,
         )
         em_intervals, _ = _collect_debuff_intervals(
-            session,
-            bearer,
-            fights=chosen,
-            report_code=report_code,
-            ability_id=EXCESS_MASS_ID,
-            actor_names=actor_names,
+            chosen,
+            em_events_by_fight,
             death_cutoffs=death_cutoffs,
         )
-
-    if include_early_mass:
         set_starts_by_fight = _identify_reverse_gravity_sets(rg_apply_events or {})
-        for fight in chosen:
-            pull_duration = compute_fight_duration_ms(fight)
-            set_starts = set_starts_by_fight.get(fight.id, [])
-            if not set_starts:
-                continue
-            em_map = em_intervals.get(fight.id, {})
-            seen_pairs: Set[Tuple[str, float]] = set()
-            for player, intervals in em_map.items():
-                for start_ts, _ in intervals:
-                    for set_start in set_starts:
-                        if set_start - early_mass_window_ms <= start_ts < set_start:
-                            key = (player, set_start)
-                            if key in seen_pairs:
-                                continue
-                            seen_pairs.add(key)
-                            early_mass_counts_by_player[player] += 1
-                            offset = start_ts - float(fight.start)
-                            player_events[player].append(
-                                TrackedEvent(
-                                    player=player,
-                                    fight_id=fight.id,
-                                    fight_name=fight.name or "",
-                                    pull_index=pull_index_by_fight.get(fight.id, 0),
-                                    timestamp=start_ts,
-                                    offset_ms=offset,
-                                    metric_id="early_mass",
-                                    pull_duration_ms=pull_duration,
-                                )
-                            )
-                            break
 
-    if include_dark_energy_hits:
-        for fight in chosen:
-            pull_duration = compute_fight_duration_ms(fight)
-            for event in fetch_events(
-                session,
-                bearer,
-                code=report_code,
-                data_type="DamageTaken",
-                start=fight.start,
-                end=fight.end,
-                ability_id=DARK_ENERGY_ID,
-                actor_names=actor_names,
-            ):
-                timestamp = event.get("timestamp")
-                if timestamp is None:
-                    continue
-                try:
-                    ts_val = float(timestamp)
-                except (TypeError, ValueError):
+    # One pass over the pulls computes every enabled metric. Events are buffered per metric so each
+    # player's list still reads overlap, then early mass, then Dark Energy, as separate passes produced.
+    events_by_metric: Dict[str, DefaultDict[str, List[TrackedEvent]]] = {
+        metric.id: defaultdict(list) for metric in metrics
+    }
+    for fight in chosen:
+        fight_start, pull_duration, fight_label, pull_index = fight_meta[fight.id]
+
+        if include_rg_em_overlap:
+            overlap_events = events_by_metric["rg_em_overlap"]
+            for overlap_ts, player in overlap_starts_by_fight.get(fight.id, []):
+                overlap_events[player].append(
+                    TrackedEvent(
+                        player=player,
+                        fight_id=fight.id,
+                        fight_name=fight_label,
+                        pull_index=pull_index,
+                        timestamp=overlap_ts,
+                        offset_ms=overlap_ts - fight_start,
+                        metric_id="rg_em_overlap",
+                        pull_duration_ms=pull_duration,
+                    )
+                )
+
+        set_starts = set_starts_by_fight.get(fight.id) if include_early_mass else None
+        if set_starts:
+            early_events = events_by_metric["early_mass"]
+            for player, start_ts in _early_mass_starts(em_intervals.get(fight.id, {}), set_starts, early_mass_window_ms):
+                early_events[player].append(
+                    TrackedEvent(
+                        player=player,
+                        fight_id=fight.id,
+                        fight_name=fight_label,
+                        pull_index=pull_index,
+                        timestamp=start_ts,
+                        offset_ms=start_ts - fight_start,
+                        metric_id="early_mass",
+                        pull_duration_ms=pull_duration,
+                    )
+                )
+
+        if include_dark_energy_hits:
+            dark_events = events_by_metric["dark_energy"]
+            cutoff = death_cutoffs.get(fight.id) if death_cutoffs else None
+            for event in fetched[("dark_energy", fight.id)]:
+                fields = _target_event_fields(event)
+                if fields is None:
                     continue
-                cutoff = death_cutoffs.get(fight.id) if death_cutoffs else None
+                ts_val, target_name, _ = fields
                 if cutoff is not None and ts_val >= cutoff:
                     continue
-                target_name = event.get("targetName")
-                if not target_name and isinstance(event.get("target"), dict):
-                    target_name = event["target"].get("name")
-                if not target_name:
-                    continue
                 amount = event.get("amount")
                 absorbed = event.get("absorbed")
                 mitigated = event.get("mitigated")
@@ -309,35 +284,40 @@ def fetch_dimensius_phase_one_summary(
                         total_amount += float(value)
                 if total_amount <= 0:
                     continue
-                dark_energy_counts_by_player[target_name] += 1
-                offset = ts_val - float(fight.start)
-                player_events[target_name].append(
+                dark_events[target_name].append(
                     TrackedEvent(
                         player=target_name,
                         fight_id=fight.id,
-                        fight_name=fight.name or "",
-                        pull_index=pull_index_by_fight.get(fight.id, 0),
+                        fight_name=fight_label,
+                        pull_index=pull_index,
                         timestamp=ts_val,
-                        offset_ms=offset,
+                        offset_ms=ts_val - fight_start,
                         metric_id="dark_energy",
                         pull_duration_ms=pull_duration,
                     )
                 )
 
+    for metric_events in events_by_metric.values():
+        for player, tracked in metric_events.items():
+            player_events[player].extend(tracked)
+
+    # Every counted hit was recorded as a TrackedEvent, so tally the events once instead of keeping
+    # a separate counter per metric in the loops above.
+    metric_counts_by_player: Dict[str, Counter[str]] = {
+        player: Counter(event.metric_id for event in events) for player, events in player_events.items()
+    }
+    metric_event_totals: Counter[str] = Counter()
+    for counts in metric_counts_by_player.values():
+        metric_event_totals.update(counts)
+    no_counts: Counter[str] = Counter()
+
     pull_count = len(chosen)
     name_to_class: Dict[str, Optional[str]] = {}
     for actor_id, name in actor_names.items():
         if name:
             name_to_class[name] = actor_classes.get(actor_id)
 
-    all_players = (
-        set(player_roles.keys())
-        | set(pulls_by_player.keys())
-        | set(overlap_counts_by_player.keys())
-        | set(early_mass_counts_by_player.keys())
-        | set(dark_energy_counts_by_player.keys())
-        | set(player_events.keys())
-    )
+    all_players: Set[str] = set().union(player_roles, pulls_by_player, player_events)
     if not all_players and participants_by_fight:
         for participants in participants_by_fight.values():
             all_players.update(participants)
@@ -346,52 +326,50 @@ def fetch_dimensius_phase_one_summary(
     metric_totals: Dict[str, MetricValue] = {}
 
     if include_rg_em_overlap:
-        total_overlaps = float(sum(overlap_counts_by_player.values()))
+        total_overlaps = float(metric_event_totals["rg_em_overlap"])
         avg_per_pull = total_overlaps / pull_count if pull_count else 0.0
         metric_totals["rg_em_overlap"] = MetricValue(total=total_overlaps, per_pull=avg_per_pull)
     if include_early_mass:
-        total_early = float(sum(early_mass_counts_by_player.values()))
+        total_early = float(metric_event_totals["early_mass"])
         avg_early = total_early / pull_count if pull_count else 0.0
         metric_totals["early_mass"] = MetricValue(total=total_early, per_pull=avg_early)
     if include_dark_energy_hits:
-        total_dark = float(sum(dark_energy_counts_by_player.values()))
+        total_dark = float(metric_event_totals["dark_energy"])
         avg_dark = total_dark / pull_count if pull_count else 0.0
         metric_totals["dark_energy"] = MetricValue(total=total_dark, per_pull=avg_dark)
 
     combined_per_pull = sum(value.per_pull for value in metric_totals.values())
 
-    def _player_metric_total(name: str) -> int:
-        total = 0
-        if include_rg_em_overlap:
-            total += overlap_counts_by_player.get(name, 0)
-        if include_early_mass:
-            total += early_mass_counts_by_player.get(name, 0)
-        if include_dark_energy_hits:
-            total += dark_energy_counts_by_player.get(name, 0)
-        return total
-
-    for player in sorted(
-        all_players,
-        key=lambda name: (
-            ROLE_PRIORITY.get(player_roles.get(name, ROLE_UNKNOWN), ROLE_PRIORITY[ROLE_UNKNOWN]),
-            -_player_metric_total(name),
-            name.lower(),
-        ),
-    ):
+    unknown_rank = ROLE_PRIORITY[ROLE_UNKNOWN]
+    role_rank = {
+        player: ROLE_PRIORITY.get(player_roles.get(player, ROLE_UNKNOWN), unknown_rank) for player in all_players
+    }
+    name_lower = {player: player.lower() for player in all_players}
+    ranked_players = sorted(
+        (
+            role_rank[name],
+            -sum(metric_counts_by_player.get(name, no_counts).values()),
+            name_lower[name],
+            name,
+        )
+        for name in all_players
+    )
+    for _, _, _, player in ranked_players:
         pulls = pulls_by_player.get(player, pull_count)
         if pulls <= 0:
             pulls = pull_count or 1
+        counts = metric_counts_by_player.get(player, no_counts)
         metrics_map: Dict[str, MetricValue] = {}
         if include_rg_em_overlap:
-            total = float(overlap_counts_by_player.get(player, 0))
+            total = float(counts["rg_em_overlap"])
             per_pull = total / pulls if pulls else 0.0
             metrics_map["rg_em_overlap"] = MetricValue(total=total, per_pull=per_pull)
         if include_early_mass:
-            total = float(early_mass_counts_by_player.get(player, 0))
+            total = float(counts["early_mass"])
             per_pull = total / pulls if pulls else 0.0
             metrics_map["early_mass"] = MetricValue(total=total, per_pull=per_pull)
         if include_dark_energy_hits:
-            total = float(dark_energy_counts_by_player.get(player, 0))
+            total = float(counts["dark_energy"])
             per_pull = total / pulls if pulls else 0.0
             metrics_map["dark_energy"] = MetricValue(total=total, per_pull=per_pull)
 
@@ -405,16 +383,16 @@ def fetch_dimensius_phase_one_summary(
                 pulls=pulls,
                 metrics=metrics_map,
                 fuckup_rate=fuckup_rate,
-                events=list(player_events.get(player, [])),
+                events=player_events.get(player, []),
             )
         )
 
     entries.sort(
         key=lambda entry: (
-            ROLE_PRIORITY.get(entry.role or ROLE_UNKNOWN, ROLE_PRIORITY[ROLE_UNKNOWN]),
+            role_rank[entry.player],
             -entry.fuckup_rate,
             -entry.pulls,
-            entry.player.lower(),
+            name_lower[entry.player],
         )
     )
 
@@ -439,7 +417,7 @@ def fetch_dimensius_phase_one_summary(
         ability_ids=ability_ids,
         ignore_after_deaths=death_limit,
         early_mass_window_seconds=early_mass_window_value,
-        player_events={player: list(events) for player, events in player_events.items()},
+        player_events={entry.player: entry.events for entry in entries if entry.events},
     )
 
 
@@ -459,110 +437,174 @@ def _normalize_early_mass_window(candidate: Optional[int]) -> Tuple[int, float]:
     return seconds, float(seconds) * 1000.0
 
 
-def _collect_debuff_intervals(
-    session: requests.Session,
-    bearer: str,
+def _debuff_transitions(
+    events: Iterable[Dict[str, Any]],
     *,
+    fight_end: float,
+    cutoff: Optional[float] = None,
+    applies: Optional[List[Tuple[float, str]]] = None,
+) -> Iterator[Tuple[float, str, bool]]:
+    """
+    Yield ``(timestamp, player, active)`` each time a player's debuff stack goes from empty to held or back.
+
+    Debuffs still held when the stream ends are closed at ``fight_end`` (or the death cutoff, if earlier).
+    Every apply event is also appended to ``applies`` when provided. Transitions follow the event order, so
+    an out-of-order stream yields out-of-order timestamps.
+    """
+    # player -> (stack count, time the first stack landed); one lookup per event.
+    stacks: Dict[str, Tuple[int, float]] = {}
+    for event in events:
+        fields = _target_event_fields(event)
+        if fields is None:
+            continue
+        ts_val, target_name, event_type = fields
+        if event_type not in APPLY_EVENTS and event_type not in REMOVE_EVENTS:
+            continue
+        if cutoff is not None and ts_val >= cutoff:
+            continue
+
+        state = stacks.get(target_name)
+        if event_type in APPLY_EVENTS:
+            if applies is not None:
+                applies.append((ts_val, target_name))
+            if state is None:
+                stacks[target_name] = (1, ts_val)
+                yield ts_val, target_name, True
+            else:
+                stacks[target_name] = (state[0] + 1, state[1])
+        elif state is not None:
+            count, start_ts = state
+            if count <= 1:
+                del stacks[target_name]
+                # A remove logged before its apply still closes the span, clamped to zero length, so
+                # the player is never left holding a debuff they already dropped.
+                yield max(ts_val, start_ts), target_name, False
+            else:
+                stacks[target_name] = (count - 1, start_ts)
+
+    end_ts = fight_end if cutoff is None or cutoff >= fight_end else cutoff
+    for player in stacks:
+        yield end_ts, player, False
+
+
+def _collect_debuff_intervals(
     fights: Iterable[Fight],
-    report_code: str,
-    ability_id: int,
-    actor_names: Dict[int, str],
+    fight_events: Dict[int, Iterable[Dict[str, Any]]],
+    *,
     capture_applies: bool = False,
     death_cutoffs: Optional[Dict[int, float]] = None,
 ) -> Tuple[Dict[int, Dict[str, List[Tuple[float, float]]]], Optional[Dict[int, List[Tuple[float, str]]]]]:
     intervals_by_fight: Dict[int, Dict[str, List[Tuple[float, float]]]] = {}
-    apply_events_by_fight: Dict[int, List[Tuple[float, str]]] = defaultdict(list)
+    apply_events_by_fight: Dict[int, List[Tuple[float, str]]] = {}
     for fight in fights:
         intervals: Dict[str, List[Tuple[float, float]]] = defaultdict(list)
-        active_start: Dict[str, float] = {}
-        stack_counts: Dict[str, int] = {}
-        cutoff = death_cutoffs.get(fight.id) if death_cutoffs else None
-        for event in fetch_events(
-            session,
-            bearer,
-            code=report_code,
-            data_type="Debuffs",
-            start=fight.start,
-            end=fight.end,
-            ability_id=ability_id,
-            actor_names=actor_names,
+        open_starts: Dict[str, float] = {}
+        applies: Optional[List[Tuple[float, str]]] = [] if capture_applies else None
+        for ts_val, player, active in _debuff_transitions(
+            fight_events.get(fight.id, ()),
+            fight_end=float(fight.end),
+            cutoff=death_cutoffs.get(fight.id) if death_cutoffs else None,
+            applies=applies,
         ):
-            event_type = (event.get("type") or "").lower()
-            if event_type not in APPLY_EVENTS and event_type not in REMOVE_EVENTS:
-                continue
-            timestamp = event.get("timestamp")
-            if timestamp is None:
-                continue
-            try:
-                ts_val = float(timestamp)
-            except (TypeError, ValueError):
-                continue
-            if cutoff is not None and ts_val >= cutoff:
-                continue
-            target_name = event.get("targetName")
-            if not target_name and isinstance(event.get("target"), dict):
-                target_name = event["target"].get("name")
-            if not target_name:
-                continue
-
-            if event_type in APPLY_EVENTS:
-                if capture_applies:
-                    apply_events_by_fight[fight.id].append((ts_val, target_name))
-                current = stack_counts.get(target_name, 0)
-                stack_counts[target_name] = current + 1
-                if current == 0:
-                    active_start[target_name] = ts_val
-            elif event_type in REMOVE_EVENTS:
-                current = stack_counts.get(target_name, 0)
-                if current <= 1:
-                    start_ts = active_start.pop(target_name, None)
-                    stack_counts.pop(target_name, None)
-                    if start_ts is not None and ts_val >= start_ts:
-                        end_ts = ts_val
-                        if cutoff is not None and end_ts > cutoff:
-                            end_ts = cutoff
-                        if cutoff is not None and start_ts >= cutoff:
-                            continue
-                        intervals[target_name].append((start_ts, end_ts))
-                else:
-                    stack_counts[target_name] = current - 1
-
-        for player, start_ts in active_start.items():
-            if cutoff is not None and start_ts >= cutoff:
-                continue
-            end_ts = float(fight.end)
-            if cutoff is not None and cutoff < end_ts:
-                end_ts = cutoff
-            intervals[player].append((start_ts, end_ts))
+            if active:
+                open_starts[player] = ts_val
+            else:
+                intervals[player].append((open_starts.pop(player), ts_val))
         for player in intervals:
-            intervals[player].sort(key=lambda pair: pair[0])
+            intervals[player].sort(key=itemgetter(0))
         intervals_by_fight[fight.id] = intervals
+        if applies:
+            applies.sort(key=itemgetter(0))
+            apply_events_by_fight[fight.id] = applies
     if capture_applies:
-        for events in apply_events_by_fight.values():
-            events.sort(key=lambda item: item[0])
-        return intervals_by_fight, dict(apply_events_by_fight)
+        return intervals_by_fight, apply_events_by_fight
     return intervals_by_fight, None
 
 
-def _detect_interval_overlaps(
-    first: List[Tuple[float, float]],
-    second: List[Tuple[float, float]],
-) -> List[float]:
-    if not first or not second:
-        return []
-    overlaps: List[float] = []
-    i = 0
-    j = 0
-    while i < len(first) and j < len(second):
-        start = max(first[i][0], second[j][0])
-        end = min(first[i][1], second[j][1])
-        if start < end:
-            overlaps.append(start)
-        if first[i][1] <= second[j][1]:
-            i += 1
-        else:
-            j += 1
-    return overlaps
+def _tag_transitions(
+    index: int,
+    transitions: Iterable[Tuple[float, str, bool]],
+) -> Iterator[Tuple[float, int, str, bool]]:
+    for ts_val, player, active in transitions:
+        yield ts_val, index, player, active
+
+
+def _collect_overlap_starts(
+    fights: Iterable[Fight],
+    first_events: Dict[int, Iterable[Dict[str, Any]]],
+    second_events: Dict[int, Iterable[Dict[str, Any]]],
+    *,
+    death_cutoffs: Optional[Dict[int, float]] = None,
+) -> Dict[int, List[Tuple[float, str]]]:
+    """
+    Sweep two debuff streams together and return ``(start, player)`` for every span in which a player held both.
+
+    Spans of zero length (one debuff dropping exactly as the other lands) are not counted.
+    """
+    overlaps_by_fight: Dict[int, List[Tuple[float, str]]] = {}
+    for fight in fights:
+        cutoff = death_cutoffs.get(fight.id) if death_cutoffs else None
+        fight_end = float(fight.end)
+        # heapq.merge needs each stream in time order; the stable sort keeps same-timestamp transitions
+        # in the order the events arrived.
+        streams = [
+            _tag_transitions(
+                index,
+                sorted(
+                    _debuff_transitions(events_by_fight.get(fight.id, ()), fight_end=fight_end, cutoff=cutoff),
+                    key=itemgetter(0),
+                ),
+            )
+            for index, events_by_fight in enumerate((first_events, second_events))
+        ]
+        holders: Tuple[Set[str], Set[str]] = (set(), set())
+        both_since: Dict[str, float] = {}
+        overlaps: List[Tuple[float, str]] = []
+        for ts_val, index, player, active in heapq.merge(*streams, key=itemgetter(0)):
+            if active:
+                holders[index].add(player)
+                if player in holders[1 - index]:
+                    both_since[player] = ts_val
+            else:
+                holders[index].discard(player)
+                start_ts = both_since.pop(player, None)
+                if start_ts is not None and start_ts < ts_val:
+                    overlaps.append((start_ts, player))
+        if overlaps:
+            overlaps_by_fight[fight.id] = overlaps
+    return overlaps_by_fight
+
+
+def _early_mass_starts(
+    intervals_by_player: Dict[str, List[Tuple[float, float]]],
+    set_starts: List[float],
+    window_ms: float,
+) -> List[Tuple[str, float]]:
+    """
+    Return ``(player, start)`` for each Excess Mass that landed within ``window_ms`` before a Reverse Gravity set.
+
+    A set counts when ``set_start - window_ms <= start < set_start``, and each player is credited at most once
+    per set, taking the earliest set not yet credited.
+    """
+    hits: List[Tuple[str, float]] = []
+    seen_pairs: Set[Tuple[str, float]] = set()
+    for player, intervals in intervals_by_player.items():
+        for start_ts, _ in intervals:
+            # set_starts is sorted, so the candidate sets are the ones right after start_ts
+            # that still fall inside the window; take the first not yet credited.
+            window_end = start_ts + window_ms
+            idx = bisect_right(set_starts, start_ts)
+            while idx < len(set_starts) and set_starts[idx] <= window_end:
+                set_start = set_starts[idx]
+                idx += 1
+                if set_start - window_ms <= start_ts:
+                    key = (player, set_start)
+                    if key in seen_pairs:
+                        continue
+                    seen_pairs.add(key)
+                    hits.append((player, start_ts))
+                    break
+    return hits
 
 
 def _identify_reverse_gravity_sets(
@@ -5,11 +5,19 @@ from __future__ import annotations
 
 from collections import defaultdict
 from dataclasses import dataclass
-from typing import DefaultDict, Dict, Iterable, List, Optional, Tuple, Set
+from typing import Any, Callable, DefaultDict, Dict, Iterable, List, Optional, Tuple, Set
 
 import requests
 
-from ..api import Fight, fetch_events, fetch_fights, fetch_player_details
+from ..api import (
+    EventQuerySpec,
+    Fight,
+    fetch_concurrently,
+    fetch_events_batched,
+    fetch_fights,
+    fetch_player_details_breakdown,
+    shared_session,
+)
 from ..env import load_env
 from .common import (
     ROLE_PRIORITY,
@@ -24,9 +32,11 @@ from .common import (
 ARTOSHION_NAME = "Artoshion"
 SHOOTING_STAR_NAME = "Shooting Star"
 SHOOTING_STAR_ID = 1246948
+_SHOOTING_STAR_NAME_LOWER = SHOOTING_STAR_NAME.lower()
 PHASE_FILTER = f'encounterPhase = 3 and target.name = "{ARTOSHION_NAME}"'
 AVERAGING_MODE_PARTICIPATION = "participation"
 AVERAGING_MODE_DAMAGE_PULLS = "damage_pulls"
+_DAMAGE_FIELDS = ("amount", "absorbed", "overkill", "blocked", "resisted", "mitigated")
 
 
 @dataclass(frozen=True)
@@ -48,7 +58,7 @@ PRIORITY_TARGETS: Dict[str, PriorityTargetConfig] = {
 DEFAULT_TARGET_SLUGS = ("artoshion",)
 
 
-@dataclass
+@dataclass(slots=True)
 class PriorityDamageEntry:
     player: str
     role: str
@@ -59,7 +69,7 @@ class PriorityDamageEntry:
     target_totals: Dict[str, "TargetDamageBreakdown"]
 
 
-@dataclass
+@dataclass(slots=True)
 class DimensiusPriorityDamageSummary:
     report_code: str
     fight_filter: Optional[str]
@@ -75,7 +85,7 @@ class DimensiusPriorityDamageSummary:
     targets: List["PriorityTargetSummary"]
 
 
-@dataclass
+@dataclass(slots=True)
 class TargetDamageBreakdown:
     target: str
     label: str
@@ -84,7 +94,7 @@ class TargetDamageBreakdown:
     pulls_with_damage: int
 
 
-@dataclass
+@dataclass(slots=True)
 class PriorityTargetSummary:
     target: str
     label: str
@@ -106,20 +116,36 @@ def fetch_dimensius_priority_damage_summary(
 ) -> DimensiusPriorityDamageSummary:
     load_env()
 
-    session = requests.Session()
+    session = shared_session()
     bearer = _resolve_token(token, client_id, client_secret)
 
     fights, actor_names, actor_classes, actor_owners = fetch_fights(session, bearer, report_code)
     chosen = _select_fights(fights, name_filter=fight_name, fight_ids=fight_ids, difficulty=difficulty)
 
     fight_id_list = [fight.id for fight in chosen]
-    aggregated_details = fetch_player_details(session, bearer, code=report_code, fight_ids=fight_id_list)
+    active_targets = _resolve_priority_targets(targets)
+    # Artoshion damage is always needed since its first hit marks the phase start.
+    enemy_names = list(dict.fromkeys([ARTOSHION_NAME, *(cfg.enemy_name for cfg in active_targets)]))
+    event_specs = _fight_event_specs(chosen, enemy_names)
+    target_names_by_id = _target_names_by_id(actor_names, enemy_names)
+
+    stage_tasks: Dict[str, Callable[[requests.Session], Any]] = {
+        "details": lambda worker: fetch_player_details_breakdown(
+            worker, bearer, code=report_code, fight_ids=fight_id_list
+        ),
+        "events": lambda worker: fetch_events_batched(
+            worker, bearer, code=report_code, specs=event_specs, actor_names=actor_names
+        ),
+    }
+    staged = fetch_concurrently(stage_tasks)
+    aggregated_details, details_by_fight = staged["details"]
+    fetched = staged["events"]
     player_roles_global, player_specs_global = _infer_player_roles(aggregated_details)
 
     roles_by_fight: Dict[int, Dict[str, str]] = {}
     participants_by_fight: Dict[int, Set[str]] = {}
     for fight in chosen:
-        details = fetch_player_details(session, bearer, code=report_code, fight_ids=[fight.id])
+        details = details_by_fight.get(fight.id, {})
         fight_roles, _ = _infer_player_roles(details)
         if fight_roles:
             roles_by_fight[fight.id] = fight_roles
@@ -127,10 +153,9 @@ def fetch_dimensius_priority_damage_summary(
         if participants:
             participants_by_fight[fight.id] = participants
 
-    player_classes: Dict[str, Optional[str]] = {}
-    for actor_id, name in actor_names.items():
-        if name:
-            player_classes[name] = actor_classes.get(actor_id)
+    player_classes: Dict[str, Optional[str]] = {
+        name: actor_classes.get(actor_id) for actor_id, name in actor_names.items() if name
+    }
 
     player_roles: Dict[str, str] = dict(player_roles_global)
     player_specs: Dict[str, Optional[str]] = dict(player_specs_global)
@@ -140,29 +165,26 @@ def fetch_dimensius_priority_damage_summary(
                 player_roles[player] = role or ROLE_UNKNOWN
             player_specs.setdefault(player, player_specs_global.get(player))
 
-    damage_totals: DefaultDict[str, float] = defaultdict(float)
+    # Only players alive at phase start are credited, and they always come from these sets, so the
+    # accumulators can be allocated at full size up front.
+    all_participants: Set[str] = set().union(*participants_by_fight.values(), *roles_by_fight.values())
+    damage_totals: Dict[str, float] = dict.fromkeys(all_participants, 0.0)
     pulls_by_player: DefaultDict[str, int] = defaultdict(int)
     fights_with_phase = 0
-    per_target_totals: Dict[str, DefaultDict[str, float]] = {
-        slug: defaultdict(float) for slug in PRIORITY_TARGETS.keys()
+    per_target_totals: Dict[str, Dict[str, float]] = {
+        slug: dict.fromkeys(all_participants, 0.0) for slug in PRIORITY_TARGETS.keys()
     }
-    per_target_damage_pulls: Dict[str, DefaultDict[str, int]] = {
-        slug: defaultdict(int) for slug in PRIORITY_TARGETS.keys()
+    per_target_damage_pulls: Dict[str, Dict[str, int]] = {
+        slug: dict.fromkeys(all_participants, 0) for slug in PRIORITY_TARGETS.keys()
     }
     target_summary_totals: DefaultDict[str, float] = defaultdict(float)
 
-    active_targets = _resolve_priority_targets(targets)
-    selected_slugs = [cfg.slug for cfg in active_targets]
-
     for fight in chosen:
+        damage_events_by_target = _split_events_by_target(fetched[("damage", fight.id)], target_names_by_id)
         art_damage_map, phase_start = _collect_target_damage(
-            session,
-            bearer,
-            report_code=report_code,
-            fight=fight,
+            damage_events_by_target.get(ARTOSHION_NAME, ()),
             actor_names=actor_names,
             actor_owners=actor_owners,
-            target_name=ARTOSHION_NAME,
             track_phase_start=True,
         )
         if phase_start is None:
@@ -171,66 +193,50 @@ def fetch_dimensius_priority_damage_summary(
         participants = participants_by_fight.get(fight.id, set())
         if not participants:
             participants = set(roles_by_fight.get(fight.id, {}).keys())
-        death_times = _collect_first_death_times(
-            session,
-            bearer,
-            report_code=report_code,
-            fight=fight,
-            actor_names=actor_names,
-        )
+        death_times = _collect_first_death_times(fetched[("deaths", fight.id)])
         alive_players = _players_alive_at_phase_start(participants, death_times, phase_start)
         if not alive_players:
             continue
         for player in alive_players:
             pulls_by_player[player] += 1
 
-        fight_damage_maps: Dict[str, Dict[str, float]] = {}
-        if "artoshion" in selected_slugs:
-            fight_damage_maps["artoshion"] = art_damage_map
+        # Per-player sums for this pull, added in target order so the combined total matches a
+        # straight sum across the selected targets.
+        fight_combined: Dict[str, float] = {}
         for cfg in active_targets:
             if cfg.slug == "artoshion":
-                continue
-            damage_map, _ = _collect_target_damage(
-                session,
-                bearer,
-                report_code=report_code,
-                fight=fight,
-                actor_names=actor_names,
-                actor_owners=actor_owners,
-                target_name=cfg.enemy_name,
-            )
-            fight_damage_maps[cfg.slug] = damage_map
-
-        for slug, damage_map in fight_damage_maps.items():
-            if not damage_map:
-                continue
+                damage_map = art_damage_map
+            else:
+                damage_map, _ = _collect_target_damage(
+                    damage_events_by_target.get(cfg.enemy_name, ()),
+                    actor_names=actor_names,
+                    actor_owners=actor_owners,
+                )
+            target_totals = per_target_totals[cfg.slug]
+            target_pulls = per_target_damage_pulls[cfg.slug]
             for player, total in damage_map.items():
                 if total <= 0 or player not in alive_players:
                     continue
-                per_target_totals[slug][player] += total
-                per_target_damage_pulls[slug][player] += 1
-                target_summary_totals[slug] += total
+                target_totals[player] += total
+                target_pulls[player] += 1
+                target_summary_totals[cfg.slug] += total
+                fight_combined[player] = fight_combined.get(player, 0.0) + total
 
-        for player in alive_players:
-            combined = 0.0
-            for slug in selected_slugs:
-                combined += fight_damage_maps.get(slug, {}).get(player, 0.0)
+        for player, combined in fight_combined.items():
             damage_totals[player] += combined
 
-    for player in pulls_by_player.keys():
-        player_classes.setdefault(player, None)
-        player_roles.setdefault(player, ROLE_UNKNOWN)
-        player_specs.setdefault(player, None)
+    player_classes.update((player, None) for player in pulls_by_player if player not in player_classes)
+    player_roles.update((player, ROLE_UNKNOWN) for player in pulls_by_player if player not in player_roles)
+    player_specs.update((player, None) for player in pulls_by_player if player not in player_specs)
 
     entries: List[PriorityDamageEntry] = []
-    players = sorted(
-        pulls_by_player.keys(),
-        key=lambda name: (
-            ROLE_PRIORITY.get(player_roles.get(name, ROLE_UNKNOWN), ROLE_PRIORITY[ROLE_UNKNOWN]),
-            name.lower(),
-        ),
+    total_damage_amount = 0.0
+    unknown_rank = ROLE_PRIORITY[ROLE_UNKNOWN]
+    ranked_players = sorted(
+        (ROLE_PRIORITY.get(player_roles.get(name, ROLE_UNKNOWN), unknown_rank), name.lower(), name)
+        for name in pulls_by_player
     )
-    for player in players:
+    for _, _, player in ranked_players:
         pulls = pulls_by_player.get(player, 0)
         if pulls <= 0:
             continue
@@ -262,8 +268,8 @@ def fetch_dimensius_priority_damage_summary(
                 target_totals=target_breakdowns,
             )
         )
+        total_damage_amount += total_damage
 
-    total_damage_amount = sum(entry.total_damage for entry in entries)
     avg_damage_per_pull = total_damage_amount / fights_with_phase if fights_with_phase else 0.0
     target_summaries: List[PriorityTargetSummary] = []
     for cfg in active_targets:
@@ -295,37 +301,105 @@ def fetch_dimensius_priority_damage_summary(
     )
 
 
+def _fight_event_specs(fights: Iterable[Fight], enemy_names: Iterable[str]) -> List[EventQuerySpec]:
+    """
+    Build one batched phase-three damage query per fight covering every enemy, plus the fight's deaths.
+
+    The damage stream is split by target ID locally, so adding targets does not add requests.
+    """
+    target_list = ", ".join(f'"{name}"' for name in enemy_names)
+    damage_filter = f"encounterPhase = 3 and target.name in ({target_list})"
+    specs: List[EventQuerySpec] = []
+    for fight in fights:
+        specs.append(
+            EventQuerySpec(
+                key=("damage", fight.id),
+                data_type="DamageDone",
+                start=fight.start,
+                end=fight.end,
+                extra_filter=damage_filter,
+            )
+        )
+        specs.append(EventQuerySpec(key=("deaths", fight.id), data_type="Deaths", start=fight.start, end=fight.end))
+    return specs
+
+
+def _target_names_by_id(actor_names: Dict[int, str], enemy_names: Iterable[str]) -> Dict[int, str]:
+    """
+    Map every actor ID carrying one of ``enemy_names`` back to that name.
+
+    This mirrors the server-side ``target.name`` filter, so the combined stream splits the same way the
+    old per-target queries did. Each stream covers a single fight, so a name shared across pulls never
+    merges damage from different fights.
+    """
+    wanted = set(enemy_names)
+    return {actor_id: name for actor_id, name in actor_names.items() if name in wanted}
+
+
+def _split_events_by_target(
+    events: Iterable[Dict[str, Any]],
+    target_names_by_id: Dict[int, str],
+) -> Dict[str, List[Dict[str, Any]]]:
+    by_target: DefaultDict[str, List[Dict[str, Any]]] = defaultdict(list)
+    for event in events:
+        target = event.get("target")
+        target_id = event.get("targetID")
+        if target_id is None and isinstance(target, dict):
+            target_id = target.get("id")
+        target_name: Optional[str] = None
+        if target_id is not None:
+            try:
+                target_name = target_names_by_id.get(int(target_id))
+            except (TypeError, ValueError):
+                target_name = None
+        if target_name is None:
+            # The server already matched this target by name; keep it even if masterData lacks the ID.
+            target_name = event.get("targetName")
+            if not target_name and isinstance(target, dict):
+                target_name = target.get("name")
+        if target_name:
+            by_target[target_name].append(event)
+    return by_target
+
+
 def _collect_target_damage(
-    session: requests.Session,
-    bearer: str,
+    events: Iterable[Dict[str, Any]],
     *,
-    report_code: str,
-    fight: Fight,
     actor_names: Dict[int, str],
     actor_owners: Dict[int, Optional[int]],
-    target_name: str,
     track_phase_start: bool = False,
 ) -> Tuple[Dict[str, float], Optional[float]]:
     damage_by_player: DefaultDict[str, float] = defaultdict(float)
     phase_start: Optional[float] = None
-    for event in fetch_events(
-        session,
-        bearer,
-        code=report_code,
-        data_type="DamageDone",
-        start=fight.start,
-        end=fight.end,
-        extra_filter=f'encounterPhase = 3 and target.name = "{target_name}"',
-        actor_names=actor_names,
-    ):
-        source_name, _ = _resolve_event_source_player(event, actor_names, actor_owners)
+    # A fight has a handful of sources against thousands of events, so owner chains are walked once
+    # per raw sourceID. Injected names are ignored: when the owner is a known actor its name wins.
+    owner_names: Dict[Any, Optional[str]] = {}
+    for event in events:
+        source_id = event.get("sourceID")
+        source = event.get("source")
+        source_name: Optional[str] = None
+        if source_id is not None and not (isinstance(source, dict) and (source.get("guid") or source.get("id"))):
+            if source_id in owner_names:
+                source_name = owner_names[source_id]
+            else:
+                source_name = owner_names[source_id] = _resolve_owner_name(source_id, actor_names, actor_owners)
+        if source_name is None:
+            source_name, _ = _resolve_event_source_player(event, actor_names, actor_owners)
         if not source_name:
             continue
-        ability_id = _extract_ability_id(event)
-        ability_name = _extract_ability_name(event)
-        if _is_shooting_star_event(source_name, ability_name, ability_id):
+        # Shooting Star damage is excluded, whether identified by source, ability id or ability name.
+        if source_name == SHOOTING_STAR_NAME:
+            continue
+        ability_id, ability_name = _extract_ability(event)
+        if ability_id == SHOOTING_STAR_ID:
             continue
-        amount = _event_damage_amount(event)
+        if ability_name and ability_name.lower() == _SHOOTING_STAR_NAME_LOWER:
+            continue
+        amount = 0.0
+        for field in _DAMAGE_FIELDS:
+            value = event.get(field)
+            if isinstance(value, (int, float)):
+                amount += value
         if amount <= 0:
             continue
         timestamp = event.get("timestamp")
@@ -339,75 +413,66 @@ def _collect_target_damage(
     return damage_by_player, phase_start
 
 
-def _event_damage_amount(event: Dict[str, object]) -> float:
-    total = 0.0
-    for field in ("amount", "absorbed", "overkill", "blocked", "resisted", "mitigated"):
-        value = event.get(field)
-        if isinstance(value, (int, float)):
-            total += float(value)
-    return total
-
-
-def _extract_ability_id(event: Dict[str, object]) -> Optional[int]:
-    candidates = [
-        event.get("abilityGameID"),
-        event.get("abilityID"),
-        (event.get("ability") or {}).get("gameID"),
-        (event.get("ability") or {}).get("id"),
-    ]
-    for candidate in candidates:
-        if candidate is None:
-            continue
-        if isinstance(candidate, (int, float)):
-            return int(candidate)
-        if isinstance(candidate, str):
-            try:
-                return int(candidate)
-            except ValueError:
+def _resolve_owner_name(
+    source_id: Any,
+    actor_names: Dict[int, str],
+    actor_owners: Dict[int, Optional[int]],
+) -> Optional[str]:
+    """
+    Follow the pet-owner chain from ``source_id`` and return the owner's actor name, if known.
+    """
+    try:
+        current = int(source_id)
+    except (TypeError, ValueError):
+        return None
+    seen: Set[int] = set()
+    while True:
+        owner = actor_owners.get(current)
+        if owner in (None, 0) or owner in seen:
+            break
+        seen.add(current)
+        current = owner
+    return actor_names.get(current)
+
+
+def _extract_ability(event: Dict[str, object]) -> Tuple[Optional[int], Optional[str]]:
+    """
+    Return ``(ability_id, ability_name)``, reading the nested ``ability`` object once for both.
+    """
+    ability = event.get("ability")
+    nested = ability if isinstance(ability, dict) else None
+
+    ability_id = event.get("abilityGameID")
+    if not isinstance(ability_id, int):
+        candidates = (
+            ability_id,
+            event.get("abilityID"),
+            nested.get("gameID") if nested is not None else None,
+            nested.get("id") if nested is not None else None,
+        )
+        ability_id = None
+        for candidate in candidates:
+            if candidate is None:
                 continue
-    return None
-
+            if isinstance(candidate, (int, float)):
+                ability_id = int(candidate)
+                break
+            if isinstance(candidate, str):
+                try:
+                    ability_id = int(candidate)
+                    break
+                except ValueError:
+                    continue
 
-def _extract_ability_name(event: Dict[str, object]) -> Optional[str]:
     name = event.get("abilityName")
-    if name:
-        return str(name)
-    ability = event.get("ability")
-    if isinstance(ability, dict):
-        ability_name = ability.get("name")
-        if ability_name:
-            return str(ability_name)
-    return None
-
-
-def _is_shooting_star_event(source_name: str, ability_name: Optional[str], ability_id: Optional[int]) -> bool:
-    if source_name == SHOOTING_STAR_NAME:
-        return True
-    if ability_id is not None and ability_id == SHOOTING_STAR_ID:
-        return True
-    if ability_name and ability_name.lower() == SHOOTING_STAR_NAME.lower():
-        return True
-    return False
-
-
-def _collect_first_death_times(
-    session: requests.Session,
-    bearer: str,
-    *,
-    report_code: str,
-    fight: Fight,
-    actor_names: Dict[int, str],
-) -> Dict[str, float]:
+    if not name and nested is not None:
+        name = nested.get("name")
+    return ability_id, str(name) if name else None
+
+
+def _collect_first_death_times(events: Iterable[Dict[str, Any]]) -> Dict[str, float]:
     first_death: Dict[str, float] = {}
-    for event in fetch_events(
-        session,
-        bearer,
-        code=report_code,
-        data_type="Deaths",
-        start=fight.start,
-        end=fight.end,
-        actor_names=actor_names,
-    ):
+    for event in events:
         timestamp = event.get("timestamp")
         if timestamp is None:
             continue
@@ -427,12 +492,8 @@ def _collect_first_death_times(
 
 
 def _players_alive_at_phase_start(participants: Set[str], death_times: Dict[str, float], phase_start: float) -> Set[str]:
-    alive = set()
-    for player in participants:
-        death_time = death_times.get(player)
-        if death_time is None or death_time >= phase_start:
-            alive.add(player)
-    return alive
+    dead = {player for player, death_time in death_times.items() if death_time < phase_start}
+    return participants - dead
 
 
 def _resolve_priority_targets(values: Optional[Iterable[str]]) -> List[PriorityTargetConfig]:
@@ -3,14 +3,14 @@ Ghost miss summary helpers.
 """
 from __future__ import annotations
 
-from collections import defaultdict
+from collections import Counter, defaultdict
 from dataclasses import dataclass
-from typing import Any, Dict, Iterable, List, Optional, Tuple, Set
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Set
 
 import requests
 
 from ..env import load_env
-from ..api import Fight, fetch_events, fetch_fights, fetch_player_details
+from ..api import Fight, fetch_concurrently, fetch_events_batched, fetch_fights, fetch_player_details_breakdown, shared_session
 from .common import (
     ROLE_PRIORITY,
     ROLE_UNKNOWN,
@@ -19,14 +19,18 @@ from .common import (
     GHOST_SET_WINDOW_MS,
     normalize_ghost_miss_mode,
     _infer_player_roles,
-    _players_from_details,
     _resolve_token,
     _select_fights,
+    death_cutoffs_from_events,
     compute_fight_duration_ms,
+    fight_event_specs,
 )
 
 
-@dataclass
+_GHOST_APPLY_TYPES = frozenset({"applydebuff", "applydebuffstack"})
+
+
+@dataclass(slots=True)
 class GhostEntry:
     player: str
     pulls: int
@@ -34,7 +38,7 @@ class GhostEntry:
     misses_per_pull: float
 
 
-@dataclass
+@dataclass(slots=True)
 class GhostEvent:
     player: str
     fight_id: int
@@ -45,7 +49,7 @@ class GhostEvent:
     pull_duration_ms: Optional[float] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class GhostSummary:
     report_code: str
     ability_id: int
@@ -91,10 +95,11 @@ def fetch_ghost_summary(
     ghost_miss_mode: Any = DEFAULT_GHOST_MISS_MODE,
     first_miss_only: Optional[bool] = None,
     ignore_after_deaths: Optional[int] = None,
+    include_events: bool = True,
 ) -> GhostSummary:
     load_env()
 
-    session = requests.Session()
+    session = shared_session()
     bearer = _resolve_token(token, client_id, client_secret)
     fights, actor_names, actor_classes, actor_owners = fetch_fights(session, bearer, report_code)
     chosen = _select_fights(fights, name_filter=fight_name, fight_ids=fight_ids)
@@ -105,143 +110,87 @@ def fetch_ghost_summary(
         mode_input = first_miss_only
     mode = normalize_ghost_miss_mode(mode_input)
 
-    aggregated_details = fetch_player_details(session, bearer, code=report_code, fight_ids=fight_id_list)
+    death_limit = ignore_after_deaths if ignore_after_deaths and ignore_after_deaths > 0 else None
+    # Deaths ride along in the same batched requests as the debuffs when a cutoff is needed. Debuffs are
+    # fetched unfiltered so _event_matches_ability can catch nested or aliased ability ids locally.
+    event_queries: List[Tuple[str, str, Optional[int]]] = [("debuffs", "Debuffs", None)]
+    if death_limit is not None:
+        event_queries.append(("deaths", "Deaths", None))
+    stage_tasks: Dict[str, Callable[[requests.Session], Any]] = {
+        "details": lambda worker: fetch_player_details_breakdown(
+            worker, bearer, code=report_code, fight_ids=fight_id_list
+        ),
+        "events": lambda worker: fetch_events_batched(
+            worker,
+            bearer,
+            code=report_code,
+            specs=fight_event_specs(chosen, event_queries),
+            limit=2000,
+            actor_names=actor_names,
+        ),
+    }
+    staged = fetch_concurrently(stage_tasks)
+    aggregated_details, details_by_fight = staged["details"]
+    fetched = staged["events"]
+    death_cutoffs_by_fight = death_cutoffs_from_events(
+        chosen,
+        {fight.id: fetched.get(("deaths", fight.id), ()) for fight in chosen},
+        death_limit,
+    )
     player_roles, player_specs = _infer_player_roles(aggregated_details)
 
     pulls_per_player: Dict[str, int] = defaultdict(int)
     roles_by_fight: Dict[int, Dict[str, str]] = {}
     for fight in chosen:
-        details = fetch_player_details(session, bearer, code=report_code, fight_ids=[fight.id])
+        details = details_by_fight.get(fight.id, {})
         fight_roles, _ = _infer_player_roles(details)
         if fight_roles:
             roles_by_fight[fight.id] = fight_roles
-        for name in set(_players_from_details(details)):
+        # The inferred roles are keyed by every named participant, so they double as the
+        # pull roster without walking the details a second time.
+        for name in fight_roles:
             pulls_per_player[name] += 1
 
-    name_to_class: Dict[str, Optional[str]] = {}
-    for actor_id, name in actor_names.items():
-        if name:
-            name_to_class[name] = actor_classes.get(actor_id)
+    name_to_class: Dict[str, Optional[str]] = {
+        name: actor_classes.get(actor_id) for actor_id, name in actor_names.items() if name
+    }
+    target_ability = int(ability_id) if ability_id is not None else None
 
     ghost_counts: Dict[str, int] = defaultdict(int)
     ghost_counts_by_fight: Dict[Tuple[int, str], int] = defaultdict(int)
     ghost_events: List[GhostEvent] = []
 
-    death_cutoffs_by_fight: Dict[int, float] = {}
-    if ignore_after_deaths and ignore_after_deaths > 0:
-        for fight in chosen:
-            total_deaths = 0
-            cutoff_ts: Optional[float] = None
-            for death_event in fetch_events(
-                session,
-                bearer,
-                code=report_code,
-                data_type="Deaths",
-                start=fight.start,
-                end=fight.end,
-                limit=1000,
-                actor_names=actor_names,
-            ):
-                event_type = (death_event.get("type") or "").lower()
-                if event_type not in {"death", "instakill"}:
-                    continue
-                ts_raw = death_event.get("timestamp")
-                try:
-                    ts_val = float(ts_raw)
-                except (TypeError, ValueError):
-                    ts_val = None
-                if ts_val is None:
-                    continue
-                total_deaths += 1
-                if total_deaths >= ignore_after_deaths:
-                    if cutoff_ts is None or ts_val < cutoff_ts:
-                        cutoff_ts = ts_val
-            if cutoff_ts is not None:
-                death_cutoffs_by_fight[fight.id] = cutoff_ts
-
     for pull_index, fight in enumerate(chosen, start=1):
         pull_duration = compute_fight_duration_ms(fight)
-        seen_targets: Set[str] = set()
-        last_counted_ts: Dict[str, int] = {}
-        fight_death_cutoff = death_cutoffs_by_fight.get(fight.id)
-        for event in fetch_events(
-            session,
-            bearer,
-            code=report_code,
-            data_type="Debuffs",
-            start=fight.start,
-            end=fight.end,
-            limit=2000,
-            ability_id=None,
-            actor_names=actor_names,
-        ):
-            event_type = (event.get("type") or "").lower()
-            if event_type not in {"applydebuff", "applydebuffstack"}:
-                continue
-            timestamp = event.get("timestamp")
-            if timestamp is None:
-                continue
-            if timestamp < fight.start + 15000:
-                continue
-            if fight_death_cutoff is not None:
-                try:
-                    ts_val = float(timestamp)
-                except (TypeError, ValueError):
-                    ts_val = None
-                if ts_val is not None and ts_val >= fight_death_cutoff:
-                    continue
-            ability_game_id = event.get("abilityGameID")
-            ability_id_match = False
-            if ability_game_id is not None:
-                try:
-                    ability_id_match = int(ability_game_id) == int(ability_id)
-                except (TypeError, ValueError):
-                    ability_id_match = False
-            ability_obj = event.get("ability") or {}
-            if not ability_id_match and isinstance(ability_obj, dict):
-                try:
-                    ability_id_match = int(ability_obj.get("id")) == int(ability_id)
-                except (TypeError, ValueError):
-                    ability_id_match = False
-            if ability_id is not None and not ability_id_match:
-                continue
-            target_name = event.get("targetName")
-            if not target_name and isinstance(event.get("target"), dict):
-                target_name = event["target"].get("name")
-            if not target_name:
-                continue
-
-            should_count = True
-            if mode == "first_per_pull":
-                if target_name in seen_targets:
-                    should_count = False
-                else:
-                    seen_targets.add(target_name)
-            elif mode == "first_per_set":
-                last_timestamp = last_counted_ts.get(target_name)
-                if last_timestamp is not None and timestamp - last_timestamp < GHOST_SET_WINDOW_MS:
-                    should_count = False
-                else:
-                    last_counted_ts[target_name] = timestamp
-
-            if not should_count:
-                continue
-
-            ghost_counts[target_name] += 1
-            ghost_counts_by_fight[(fight.id, target_name)] += 1
-            offset_ms = float(timestamp) - float(fight.start)
-            ghost_events.append(
-                GhostEvent(
-                    player=target_name,
-                    fight_id=fight.id,
-                    fight_name=fight.name or "",
-                    pull_index=pull_index,
-                    timestamp=float(timestamp),
-                    offset_ms=offset_ms,
-                    pull_duration_ms=pull_duration,
-                )
+        fight_start = float(fight.start)
+        counted = _process_ghost_events(
+            fetched[("debuffs", fight.id)],
+            grace_end=fight.start + 15000,
+            ability_id=target_ability,
+            cutoff=death_cutoffs_by_fight.get(fight.id),
+            mode=mode,
+        )
+        if include_events:
+            fight_name_label = fight.name or ""
+            ghost_events.extend(
+                [
+                    GhostEvent(
+                        player=target_name,
+                        fight_id=fight.id,
+                        fight_name=fight_name_label,
+                        pull_index=pull_index,
+                        timestamp=ts_float,
+                        offset_ms=ts_float - fight_start,
+                        pull_duration_ms=pull_duration,
+                    )
+                    for target_name, ts_float in counted
+                ]
             )
 
+        for target_name, count in Counter(name for name, _ in counted).items():
+            ghost_counts[target_name] += count
+            ghost_counts_by_fight[(fight.id, target_name)] += count
+
     all_players = set(pulls_per_player.keys()) | set(ghost_counts.keys())
     if not all_players:
         all_players = set(player_roles.keys())
@@ -296,6 +245,91 @@ def fetch_ghost_summary(
     )
 
 
+def _process_ghost_events(
+    events: Iterable[Dict[str, Any]],
+    *,
+    grace_end: float,
+    ability_id: Optional[int],
+    cutoff: Optional[float],
+    mode: GhostMissMode,
+) -> List[Tuple[str, float]]:
+    """
+    Return ``(target_name, timestamp)`` pairs for the ghost applications in one pull that should count.
+    """
+    counted: List[Tuple[str, float]] = []
+    append = counted.append
+    seen_targets: Set[str] = set()
+    seen_add = seen_targets.add
+    last_counted_ts: Dict[str, Any] = {}
+    first_per_pull = mode == "first_per_pull"
+    first_per_set = mode == "first_per_set"
+    apply_types = _GHOST_APPLY_TYPES
+    for event in events:
+        get = event.get
+        event_type = (get("type") or "").lower()
+        if event_type not in apply_types:
+            continue
+        if ability_id is not None:
+            # Debuffs arrive unfiltered; a plain int id settles the match without the coercing helper,
+            # which is only needed for string or nested ids.
+            raw_ability = get("abilityGameID")
+            if type(raw_ability) is int:
+                if raw_ability != ability_id:
+                    continue
+            elif not _event_matches_ability(event, ability_id):
+                continue
+        timestamp = get("timestamp")
+        if timestamp is None:
+            continue
+        if timestamp < grace_end:
+            continue
+        if cutoff is not None:
+            try:
+                ts_val = float(timestamp)
+            except (TypeError, ValueError):
+                ts_val = None
+            if ts_val is not None and ts_val >= cutoff:
+                continue
+        target_name = get("targetName")
+        if not target_name and isinstance(get("target"), dict):
+            target_name = event["target"].get("name")
+        if not target_name:
+            continue
+
+        if first_per_pull:
+            if target_name in seen_targets:
+                continue
+            seen_add(target_name)
+        elif first_per_set:
+            last_timestamp = last_counted_ts.get(target_name)
+            if last_timestamp is not None and timestamp - last_timestamp < GHOST_SET_WINDOW_MS:
+                continue
+            last_counted_ts[target_name] = timestamp
+
+        append((target_name, float(timestamp)))
+    return counted
+
+
+def _event_matches_ability(event: Dict[str, Any], ability_id: int) -> bool:
+    """
+    Compare an event's ability against ``ability_id``, coercing ``abilityGameID`` or the nested ability id.
+    """
+    ability_game_id = event.get("abilityGameID")
+    if ability_game_id is not None:
+        try:
+            if int(ability_game_id) == ability_id:
+                return True
+        except (TypeError, ValueError):
+            pass
+    ability_obj = event.get("ability") or {}
+    if isinstance(ability_obj, dict):
+        try:
+            return int(ability_obj.get("id")) == ability_id
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
 __all__ = [
     "GhostEntry",
     "GhostSummary",
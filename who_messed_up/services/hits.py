@@ -5,22 +5,31 @@ from __future__ import annotations
 
 import re
 from dataclasses import dataclass
-from typing import Any, Dict, Iterable, List, Optional, Tuple, Set
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Set
 
 import requests
 
 from ..analysis import HitAggregate, count_hits
-from ..api import Fight, fetch_events, fetch_fights, fetch_player_details
+from ..api import (
+    EventQuerySpec,
+    Fight,
+    fetch_concurrently,
+    fetch_events_batched,
+    fetch_fights,
+    fetch_player_details_breakdown,
+    shared_session,
+)
 from ..env import load_env
 from .common import (
     ROLE_UNKNOWN,
     _infer_player_roles,
     _resolve_token,
     _select_fights,
+    death_cutoffs_from_events,
 )
 
 
-@dataclass
+@dataclass(slots=True)
 class HitSummary:
     report_code: str
     data_type: str
@@ -102,7 +111,7 @@ def fetch_hit_summary(
 ) -> HitSummary:
     load_env()
 
-    session = requests.Session()
+    session = shared_session()
     bearer = _resolve_token(token, client_id, client_secret)
     fights, actor_names, actor_classes, actor_owners = fetch_fights(session, bearer, report_code)
     chosen = _select_fights(fights, name_filter=fight_name, fight_ids=fight_ids)
@@ -110,95 +119,54 @@ def fetch_hit_summary(
     ability_re = re.compile(ability_regex) if ability_regex else None
 
     fight_id_list = [fight.id for fight in chosen]
-    player_details = fetch_player_details(session, bearer, code=report_code, fight_ids=fight_id_list)
-    player_roles, player_specs = _infer_player_roles(player_details)
-    roles_by_fight: Dict[int, Dict[str, str]] = {}
+    death_limit = ignore_after_deaths if ignore_after_deaths and ignore_after_deaths > 0 else None
+    event_specs: List[EventQuerySpec] = []
     for fight in chosen:
-        fight_details = fetch_player_details(session, bearer, code=report_code, fight_ids=[fight.id])
-        fight_roles, _ = _infer_player_roles(fight_details)
-        if fight_roles:
-            roles_by_fight[fight.id] = fight_roles
-    death_cutoffs_by_fight: Dict[int, float] = {}
-    if ignore_after_deaths and ignore_after_deaths > 0:
-        for fight in chosen:
-            total_deaths = 0
-            cutoff_ts: Optional[float] = None
-            for death_event in fetch_events(
-                session,
-                bearer,
-                code=report_code,
-                data_type="Deaths",
-                start=fight.start,
-                end=fight.end,
-                limit=1000,
-                actor_names=actor_names,
-            ):
-                event_type = (death_event.get("type") or "").lower()
-                if event_type not in {"death", "instakill"}:
-                    continue
-                ts_raw = death_event.get("timestamp")
-                try:
-                    ts_val = float(ts_raw)
-                except (TypeError, ValueError):
-                    ts_val = None
-                if ts_val is None:
-                    continue
-                total_deaths += 1
-                if total_deaths >= ignore_after_deaths:
-                    if cutoff_ts is None or ts_val < cutoff_ts:
-                        cutoff_ts = ts_val
-            if cutoff_ts is not None:
-                death_cutoffs_by_fight[fight.id] = cutoff_ts
-
-    def _event_stream() -> Iterable[Dict[str, Any]]:
-        for fight in chosen:
-            cutoff = None
-            if exclude_final_ms is not None:
-                cutoff = float(fight.end) - float(exclude_final_ms)
-            fight_death_cutoff = death_cutoffs_by_fight.get(fight.id)
-            seen_targets: Set[str] = set() if first_hit_only else set()
-            for event in fetch_events(
-                session,
-                bearer,
-                code=report_code,
+        event_specs.append(
+            EventQuerySpec(
+                key=("hits", fight.id),
                 data_type=data_type,
                 start=fight.start,
                 end=fight.end,
-                limit=limit,
                 ability_id=ability_id,
                 ability_name=ability,
-                actor_names=actor_names,
-            ):
-                if cutoff is not None:
-                    ts = event.get("timestamp")
-                    if isinstance(ts, (int, float)):
-                        if ts >= cutoff:
-                            continue
-                    else:
-                        try:
-                            ts_val = float(ts)
-                        except (TypeError, ValueError):
-                            ts_val = None
-                        if ts_val is not None and ts_val >= cutoff:
-                            continue
-                if fight_death_cutoff is not None:
-                    ts = event.get("timestamp")
-                    try:
-                        ts_val = float(ts)
-                    except (TypeError, ValueError):
-                        ts_val = None
-                    if ts_val is not None and ts_val >= fight_death_cutoff:
-                        continue
-                target_name = event.get("targetName")
-                if not target_name and isinstance(event.get("target"), dict):
-                    target_name = event["target"].get("name")
-                if target_name and first_hit_only:
-                    if target_name in seen_targets:
-                        continue
-                    seen_targets.add(target_name)
-                yield event
-
-    events_iter = _event_stream()
+            )
+        )
+        # Deaths ride along in the same batched requests when a cutoff is needed.
+        if death_limit is not None:
+            event_specs.append(
+                EventQuerySpec(key=("deaths", fight.id), data_type="Deaths", start=fight.start, end=fight.end)
+            )
+    stage_tasks: Dict[str, Callable[[requests.Session], Any]] = {
+        "details": lambda worker: fetch_player_details_breakdown(
+            worker, bearer, code=report_code, fight_ids=fight_id_list
+        ),
+        "events": lambda worker: fetch_events_batched(
+            worker, bearer, code=report_code, specs=event_specs, limit=limit, actor_names=actor_names
+        ),
+    }
+    staged = fetch_concurrently(stage_tasks)
+    player_details, details_by_fight = staged["details"]
+    fetched = staged["events"]
+    death_cutoffs_by_fight = death_cutoffs_from_events(
+        chosen,
+        {fight.id: fetched.get(("deaths", fight.id), ()) for fight in chosen},
+        death_limit,
+    )
+    player_roles, player_specs = _infer_player_roles(player_details)
+    roles_by_fight: Dict[int, Dict[str, str]] = {}
+    for fight in chosen:
+        fight_roles, _ = _infer_player_roles(details_by_fight.get(fight.id, {}))
+        if fight_roles:
+            roles_by_fight[fight.id] = fight_roles
+
+    events_iter = _iter_hit_events(
+        chosen,
+        fetched,
+        death_cutoffs_by_fight,
+        exclude_final_ms=exclude_final_ms,
+        first_hit_only=first_hit_only,
+    )
 
     agg: HitAggregate = count_hits(
         events_iter,
@@ -210,10 +178,9 @@ def fetch_hit_summary(
         ignore_zero_damage_hits=ignore_zero_damage_hits,
     )
 
-    name_to_class: Dict[str, Optional[str]] = {}
-    for actor_id, name in actor_names.items():
-        if name:
-            name_to_class[name] = actor_classes.get(actor_id)
+    name_to_class: Dict[str, Optional[str]] = {
+        name: actor_classes.get(actor_id) for actor_id, name in actor_names.items() if name
+    }
 
     player_classes = {player: name_to_class.get(player) for player in agg.hits_by_player.keys()}
     player_roles_full = {player: player_roles.get(player, ROLE_UNKNOWN) for player in agg.hits_by_player.keys()}
@@ -244,6 +211,65 @@ def fetch_hit_summary(
     )
 
 
+def _iter_hit_events(
+    fights: Iterable[Fight],
+    fetched: Dict[Tuple[str, int], List[Dict[str, Any]]],
+    death_cutoffs_by_fight: Dict[int, float],
+    *,
+    exclude_final_ms: Optional[float],
+    first_hit_only: bool,
+) -> Iterable[Dict[str, Any]]:
+    """
+    Yield every pull's fetched hits in fight order, applying the death, final-window and first-hit filters.
+    """
+    for fight in fights:
+        # Both the final-window exclusion and the death cutoff drop events at or after a
+        # timestamp, so only the earlier of the two needs checking.
+        cutoffs = [death_cutoffs_by_fight.get(fight.id)]
+        if exclude_final_ms is not None:
+            cutoffs.append(float(fight.end) - float(exclude_final_ms))
+        active_cutoffs = [value for value in cutoffs if value is not None]
+        cutoff = min(active_cutoffs) if active_cutoffs else None
+        events = fetched[("hits", fight.id)]
+        if cutoff is None and not first_hit_only:
+            # Nothing to filter per event, so hand the fetched list straight to count_hits.
+            yield from events
+            continue
+        yield from _filter_hit_events(events, cutoff=cutoff, first_hit_only=first_hit_only)
+
+
+def _filter_hit_events(
+    events: Iterable[Dict[str, Any]],
+    *,
+    cutoff: Optional[float],
+    first_hit_only: bool,
+) -> Iterable[Dict[str, Any]]:
+    """
+    Yield one pull's events that land before ``cutoff``, keeping only the first per target when asked.
+    """
+    seen_targets: Optional[Set[str]] = set() if first_hit_only else None
+    for event in events:
+        get = event.get
+        if cutoff is not None:
+            ts = get("timestamp")
+            if not isinstance(ts, (int, float)):
+                try:
+                    ts = float(ts)
+                except (TypeError, ValueError):
+                    ts = None
+            if ts is not None and ts >= cutoff:
+                continue
+        if seen_targets is not None:
+            target_name = get("targetName")
+            if not target_name and isinstance(get("target"), dict):
+                target_name = event["target"].get("name")
+            if target_name:
+                if target_name in seen_targets:
+                    continue
+                seen_targets.add(target_name)
+        yield event
+
+
 __all__ = [
     "HitSummary",
     "fetch_hit_summary",
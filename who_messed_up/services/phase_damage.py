@@ -5,12 +5,20 @@ from __future__ import annotations
 
 from collections import defaultdict
 from dataclasses import dataclass
-from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from typing import Any, Callable, Dict, FrozenSet, Hashable, Iterable, List, Optional, Set, Tuple
 
 import requests
 
 from ..env import load_env
-from ..api import fetch_fights, fetch_player_details, fetch_table
+from ..api import (
+    Fight,
+    TableQuerySpec,
+    fetch_concurrently,
+    fetch_fights,
+    fetch_player_details_breakdown,
+    fetch_tables_batched,
+    shared_session,
+)
 from .common import (
     FightSelectionError,
     NEXUS_PHASE_LABELS,
@@ -25,7 +33,11 @@ from .common import (
 )
 
 
-@dataclass
+_DAMAGE_ROLES = frozenset({"Tank", "Melee", "Ranged", ROLE_UNKNOWN})
+_HEALING_ROLES = frozenset({"Healer"})
+
+
+@dataclass(slots=True)
 class PhaseMetric:
     phase_id: str
     phase_label: str
@@ -33,7 +45,7 @@ class PhaseMetric:
     average_per_pull: float
 
 
-@dataclass
+@dataclass(slots=True)
 class PhaseDamageEntry:
     player: str
     role: str
@@ -42,7 +54,7 @@ class PhaseDamageEntry:
     metrics: List[PhaseMetric]
 
 
-@dataclass
+@dataclass(slots=True)
 class PhaseDamageSummary:
     report_code: str
     fight_filter: Optional[str]
@@ -68,7 +80,16 @@ def _fetch_phase_damage_summary_single(
     client_id: Optional[str] = None,
     client_secret: Optional[str] = None,
     phase_labels: Optional[Dict[str, str]] = None,
+    session: Optional[requests.Session] = None,
+    concurrent_pulls: bool = True,
 ) -> PhaseDamageSummary:
+    """
+    Summarise one report's phase damage.
+
+    ``session`` defaults to the shared session. Pass ``concurrent_pulls=False`` when already running on a
+    ``fetch_concurrently`` worker, so each pull's tables are fetched in turn on that worker's session
+    instead of opening a nested pool.
+    """
     load_env()
 
     if phase_labels is None:
@@ -76,7 +97,8 @@ def _fetch_phase_damage_summary_single(
 
     fight_id_filter = [int(fid) for fid in fight_ids] if fight_ids else None
 
-    session = requests.Session()
+    if session is None:
+        session = shared_session()
     bearer = _resolve_token(token, client_id, client_secret)
     fights, actor_names, actor_classes, actor_owners = fetch_fights(session, bearer, report_code)
     chosen = _select_fights(fights, name_filter=fight_name, fight_ids=fight_id_filter)
@@ -84,13 +106,14 @@ def _fetch_phase_damage_summary_single(
     selected_phases = _normalize_phase_ids(phases, phase_labels=phase_labels)
 
     fight_id_list = [fight.id for fight in chosen]
-    aggregated_details = fetch_player_details(session, bearer, code=report_code, fight_ids=fight_id_list)
+    aggregated_details, details_by_fight = fetch_player_details_breakdown(
+        session, bearer, code=report_code, fight_ids=fight_id_list
+    )
     player_roles_global, player_specs_global = _infer_player_roles(aggregated_details)
 
     roles_by_fight: Dict[int, Dict[str, str]] = {}
     for fight in chosen:
-        details = fetch_player_details(session, bearer, code=report_code, fight_ids=[fight.id])
-        fight_roles, _ = _infer_player_roles(details)
+        fight_roles, _ = _infer_player_roles(details_by_fight.get(fight.id, {}))
         if fight_roles:
             roles_by_fight[fight.id] = fight_roles
 
@@ -112,11 +135,14 @@ def _fetch_phase_damage_summary_single(
         for player, role in fight_roles.items():
             fight_ids_by_player_role[(player, role)].add(fight.id)
 
-    damage_roles = {"Tank", "Melee", "Ranged", ROLE_UNKNOWN}
-    healing_roles = {"Healer"}
+    resolved_actors: Dict[int, Tuple[Optional[int], Optional[str]]] = {}
 
     def resolve_actor(actor_key: Any) -> Tuple[Optional[int], Optional[str]]:
         if isinstance(actor_key, int):
+            # Every table repeats the same actors, so walk each owner chain only once.
+            cached = resolved_actors.get(actor_key)
+            if cached is not None:
+                return cached
             current = actor_key
             seen: Set[int] = set()
             while True:
@@ -126,7 +152,9 @@ def _fetch_phase_damage_summary_single(
                 seen.add(current)
                 current = owner
             name = actor_names.get(current) or actor_names.get(actor_key)
-            return current, name
+            resolved = (current, name)
+            resolved_actors[actor_key] = resolved
+            return resolved
         if isinstance(actor_key, str):
             return None, actor_key
         return None, None
@@ -135,107 +163,129 @@ def _fetch_phase_damage_summary_single(
         value = entry.get("total")
         if value is None:
             value = entry.get("totalReduced")
+        # Tables report plain numbers, so skip the coercion guard for them.
+        value_type = type(value)
+        if value_type is float:
+            return value
+        if value_type is int:
+            return float(value)
         try:
             return float(value or 0.0)
         except (TypeError, ValueError):
             return 0.0
 
-    phase_totals: Dict[Tuple[str, str], Dict[str, float]] = defaultdict(lambda: defaultdict(float))
+    # Totals are keyed flat by (player, role, phase); player_role_keys keeps first-seen order of the pairs.
+    phase_totals: Dict[Tuple[str, str, str], float] = {}
+    player_role_keys: Dict[Tuple[str, str], None] = {}
 
-    for phase_id in selected_phases:
-        filter_expr = None
-        if phase_id != "full":
-            try:
-                numeric_phase = int(phase_id)
-                filter_expr = f"encounterPhase = {numeric_phase}"
-            except ValueError:
-                filter_expr = None
-
-        for fight in chosen:
-            def consume_entries(entries: Iterable[Dict[str, Any]], *, allowed_roles: Set[str]) -> None:
-                for entry in entries:
-                    actor_key = entry.get("id")
-                    if actor_key is None:
-                        continue
-                    total_amount = sum_entry_total(entry)
-                    if total_amount <= 0:
-                        continue
-                    owner_id, owner_name = resolve_actor(actor_key)
-                    if not owner_name:
-                        owner_name = entry.get("name")
-                    if not owner_name:
-                        continue
-                    role = (
-                        roles_by_fight.get(fight.id, {}).get(owner_name)
-                        or player_roles_global.get(owner_name)
-                        or ROLE_UNKNOWN
-                    )
-                    if role not in allowed_roles:
-                        continue
-                    key = (owner_name, role)
-                    phase_totals[key][phase_id] += float(total_amount)
-                    if owner_name not in player_classes and owner_id is not None:
-                        player_classes[owner_name] = actor_classes.get(owner_id)
-                    player_roles.setdefault(owner_name, role)
-                    valid_players.add(owner_name)
-
-            damage_table = fetch_table(
-                session,
-                bearer,
-                code=report_code,
-                data_type="DamageDone",
-                fight_id=fight.id,
-                start=fight.start,
-                end=fight.end,
-                filter_expr=filter_expr,
-            )
-            consume_entries(damage_table.get("entries") or [], allowed_roles=damage_roles)
+    # _normalize_phase_ids canonicalises numeric phases via str(int(...)), so a digit check suffices.
+    phase_filters: Dict[str, Optional[str]] = {
+        phase_id: f"encounterPhase = {int(phase_id)}" if phase_id.lstrip("-").isdigit() else None
+        for phase_id in selected_phases
+    }
 
-            healing_table = fetch_table(
-                session,
-                bearer,
-                code=report_code,
-                data_type="Healing",
+    def fight_tables_task(fight: Fight) -> Callable[[requests.Session], Dict[Hashable, Dict[str, Any]]]:
+        specs = [
+            TableQuerySpec(
+                key=(phase_id, fight.id, data_type),
+                data_type=data_type,
                 fight_id=fight.id,
                 start=fight.start,
                 end=fight.end,
-                filter_expr=filter_expr,
+                filter_expr=phase_filters[phase_id],
             )
-            consume_entries(healing_table.get("entries") or [], allowed_roles=healing_roles)
+            for phase_id in selected_phases
+            for data_type in ("DamageDone", "Healing")
+        ]
+        return lambda worker: fetch_tables_batched(worker, bearer, code=report_code, specs=specs)
+
+    # Each pull's phase tables share one aliased request; pulls run concurrently unless this report is
+    # itself being summarised on a worker thread.
+    if concurrent_pulls:
+        tables_by_fight = fetch_concurrently({fight.id: fight_tables_task(fight) for fight in chosen})
+    else:
+        tables_by_fight = {fight.id: fight_tables_task(fight)(session) for fight in chosen}
+    # Re-key in phase, pull, damage-then-healing order so totals accumulate in a stable order.
+    tables: Dict[Tuple[str, int, str], Dict[str, Any]] = {
+        (phase_id, fight.id, data_type): tables_by_fight[fight.id][(phase_id, fight.id, data_type)]
+        for phase_id in selected_phases
+        for fight in chosen
+        for data_type in ("DamageDone", "Healing")
+    }
+
+    # Per-pull roles win over the aggregate ones; merging them once leaves one lookup per entry.
+    effective_roles_by_fight: Dict[int, Dict[str, str]] = {
+        fight.id: {**player_roles_global, **roles_by_fight.get(fight.id, {})} for fight in chosen
+    }
+
+    def consume_entries(
+        phase_id: str, fight_id: int, entries: Iterable[Dict[str, Any]], allowed_roles: FrozenSet[str]
+    ) -> None:
+        effective_roles = effective_roles_by_fight[fight_id]
+        for entry in entries:
+            actor_key = entry.get("id")
+            if actor_key is None:
+                continue
+            total_amount = sum_entry_total(entry)
+            if total_amount <= 0:
+                continue
+            owner_id, owner_name = resolve_actor(actor_key)
+            if not owner_name:
+                owner_name = entry.get("name")
+            if not owner_name:
+                continue
+            role = effective_roles.get(owner_name, ROLE_UNKNOWN)
+            if role not in allowed_roles:
+                continue
+            total_key = (owner_name, role, phase_id)
+            phase_totals[total_key] = phase_totals.get(total_key, 0.0) + float(total_amount)
+            player_role_keys.setdefault((owner_name, role))
+            if owner_name not in player_classes and owner_id is not None:
+                player_classes[owner_name] = actor_classes.get(owner_id)
+            player_roles.setdefault(owner_name, role)
+            valid_players.add(owner_name)
+
+    allowed_roles_by_type = {"DamageDone": _DAMAGE_ROLES, "Healing": _HEALING_ROLES}
+    # Task keys were inserted phase by phase, pull by pull, damage before healing, which keeps the
+    # accumulation order identical to the original nested loops.
+    for (phase_id, fight_id, data_type), table in tables.items():
+        consume_entries(phase_id, fight_id, table.get("entries") or [], allowed_roles_by_type[data_type])
 
     for player, role in list(fight_ids_by_player_role.keys()):
         if player not in valid_players:
             continue
-        key = (player, role)
-        phase_totals.setdefault(key, defaultdict(float))
+        player_role_keys.setdefault((player, role))
         player_classes.setdefault(player, None)
         player_roles.setdefault(player, role)
         player_specs.setdefault(player, None)
 
-    entries: List[PhaseDamageEntry] = []
-    for player, role in sorted(
-        phase_totals.keys(),
+    # Drop players without a valid pull before sorting, and keep the pull count for averaging.
+    eligible: List[Tuple[str, str, int]] = []
+    for player, role in player_role_keys:
+        if player not in valid_players:
+            continue
+        pulls = len(fight_ids_by_player_role.get((player, role), ()))
+        if pulls > 0:
+            eligible.append((player, role, pulls))
+    eligible.sort(
         key=lambda item: (
             ROLE_PRIORITY.get(item[1] or ROLE_UNKNOWN, ROLE_PRIORITY[ROLE_UNKNOWN]),
             item[0].lower(),
-        ),
-    ):
-        if player not in valid_players:
-            continue
-        pulls = len(fight_ids_by_player_role.get((player, role), set()))
-        if pulls <= 0:
-            continue
-        totals_for_player = phase_totals[(player, role)]
+        )
+    )
+    labelled_phases = tuple((phase_id, phase_labels.get(phase_id, phase_id)) for phase_id in selected_phases)
+
+    entries: List[PhaseDamageEntry] = []
+    for player, role, pulls in eligible:
         metrics: List[PhaseMetric] = []
-        for phase_id in selected_phases:
-            total_amount = totals_for_player.get(phase_id, 0.0)
-            average_per_pull = total_amount / pulls if pulls else 0.0
+        for phase_id, phase_label in labelled_phases:
+            total_amount = phase_totals.get((player, role, phase_id), 0.0)
             metrics.append(
                 PhaseMetric(
                     phase_id=phase_id,
-                    phase_label=phase_labels.get(phase_id, phase_id),
+                    phase_label=phase_label,
                     total_amount=total_amount,
-                    average_per_pull=average_per_pull,
+                    average_per_pull=total_amount / pulls,
                 )
             )
         player_classes.setdefault(player, None)
@@ -283,16 +333,6 @@ def fetch_phase_damage_summary(
 ) -> PhaseDamageSummary:
     phase_labels = _resolve_phase_labels(phase_profile)
     primary_code = _sanitize_report_code(report_code)
-    primary_summary = _fetch_phase_damage_summary_single(
-        report_code=primary_code,
-        phases=phases,
-        fight_name=fight_name,
-        fight_ids=fight_ids,
-        token=token,
-        client_id=client_id,
-        client_secret=client_secret,
-        phase_labels=phase_labels,
-    )
 
     extra_codes: List[str] = []
     if extra_report_codes:
@@ -307,22 +347,33 @@ def fetch_phase_damage_summary(
                 continue
             extra_codes.append(code_str)
 
-    if not extra_codes:
-        return primary_summary
+    # Materialise once so concurrent report fetches never share a one-shot iterator.
+    fight_id_values = list(fight_ids) if fight_ids else None
+    phase_values = list(phases) if phases is not None else None
 
-    summaries: List[PhaseDamageSummary] = [primary_summary]
-    for extra_code in extra_codes:
-        extra_summary = _fetch_phase_damage_summary_single(
-            report_code=extra_code,
-            phases=phases,
+    def summarize(code: str, worker: Optional[requests.Session] = None) -> PhaseDamageSummary:
+        return _fetch_phase_damage_summary_single(
+            report_code=code,
+            phases=phase_values,
             fight_name=fight_name,
-            fight_ids=fight_ids,
+            fight_ids=fight_id_values,
             token=token,
             client_id=client_id,
             client_secret=client_secret,
             phase_labels=phase_labels,
+            session=worker,
+            concurrent_pulls=worker is None,
         )
-        summaries.append(extra_summary)
+
+    if not extra_codes:
+        return summarize(primary_code)
+
+    # Each report is summarised independently on its worker's session, fetching its pulls in turn so
+    # the pools never nest; results come back keyed in submission order.
+    report_codes = [primary_code] + extra_codes
+    by_code = fetch_concurrently({code: (lambda worker, code=code: summarize(code, worker)) for code in report_codes})
+    summaries: List[PhaseDamageSummary] = [by_code[code] for code in report_codes]
+    primary_summary = summaries[0]
 
     base_signature = primary_summary.fight_signature
     base_phases = list(primary_summary.phases)
@@ -350,7 +401,9 @@ def fetch_phase_damage_summary(
 
     phase_ids = list(primary_summary.phases)
     phase_labels = dict(primary_summary.phase_labels)
-    combined_totals: Dict[Tuple[str, str], Dict[str, float]] = defaultdict(lambda: defaultdict(float))
+    phase_id_set = frozenset(phase_ids)
+    # Flat (player, role, phase) maxima; combined_pulls keeps the first-seen order of the pairs.
+    combined_totals: Dict[Tuple[str, str, str], float] = {}
     combined_pulls: Dict[Tuple[str, str], int] = {}
     combined_classes: Dict[str, Optional[str]] = dict(primary_summary.player_classes)
     combined_roles: Dict[str, str] = dict(primary_summary.player_roles)
@@ -359,41 +412,43 @@ def fetch_phase_damage_summary(
     def merge_entry(summary: PhaseDamageSummary, entry: PhaseDamageEntry) -> None:
         key = (entry.player, entry.role)
         combined_pulls[key] = max(combined_pulls.get(key, 0), entry.pulls)
-        if entry.player not in combined_classes or combined_classes[entry.player] is None:
+        if combined_classes.get(entry.player) is None:
             combined_classes[entry.player] = summary.player_classes.get(entry.player)
-        if entry.player not in combined_roles or combined_roles.get(entry.player) in (None, ROLE_UNKNOWN):
+        if combined_roles.get(entry.player) in (None, ROLE_UNKNOWN):
             combined_roles[entry.player] = entry.role
         combined_specs.setdefault(entry.player, summary.player_specs.get(entry.player))
-        totals = combined_totals[key]
         for metric in entry.metrics:
-            if metric.phase_id not in phase_ids:
+            if metric.phase_id not in phase_id_set:
                 continue
-            totals[metric.phase_id] = max(totals.get(metric.phase_id, 0.0), metric.total_amount)
+            total_key = (entry.player, entry.role, metric.phase_id)
+            combined_totals[total_key] = max(combined_totals.get(total_key, 0.0), metric.total_amount)
 
     for summary in summaries:
         for player, class_name in summary.player_classes.items():
-            if player not in combined_classes or combined_classes[player] is None:
+            if combined_classes.get(player) is None:
                 combined_classes[player] = class_name
         for player, role in summary.player_roles.items():
-            if player not in combined_roles or combined_roles[player] in (None, ROLE_UNKNOWN):
+            if combined_roles.get(player) in (None, ROLE_UNKNOWN):
                 combined_roles[player] = role
         for player, spec in summary.player_specs.items():
-            if player not in combined_specs or combined_specs[player] is None:
+            if combined_specs.get(player) is None:
                 combined_specs[player] = spec
         for entry in summary.entries:
             merge_entry(summary, entry)
 
+    labelled_phases = tuple(
+        (phase_id, phase_labels.get(phase_id, NEXUS_PHASE_LABELS.get(phase_id, phase_id))) for phase_id in phase_ids
+    )
     merged_entries: List[PhaseDamageEntry] = []
-    for (player, role), totals in combined_totals.items():
-        pulls = combined_pulls.get((player, role), primary_summary.pull_count)
+    for (player, role), pulls in combined_pulls.items():
         metrics: List[PhaseMetric] = []
-        for phase_id in phase_ids:
-            total_amount = totals.get(phase_id, 0.0)
+        for phase_id, phase_label in labelled_phases:
+            total_amount = combined_totals.get((player, role, phase_id), 0.0)
             average = total_amount / pulls if pulls else 0.0
             metrics.append(
                 PhaseMetric(
                     phase_id=phase_id,
-                    phase_label=phase_labels.get(phase_id, NEXUS_PHASE_LABELS.get(phase_id, phase_id)),
+                    phase_label=phase_label,
                     total_amount=total_amount,
                     average_per_pull=average,
                 )
@@ -18,7 +18,7 @@ from .ghosts import GhostEvent, fetch_ghost_summary
 from .hits import fetch_hit_summary
 
 
-@dataclass
+@dataclass(slots=True)
 class PhasePlayerEntry:
     player: str
     role: str
@@ -31,7 +31,7 @@ class PhasePlayerEntry:
     fuckup_rate: float
 
 
-@dataclass
+@dataclass(slots=True)
 class PhaseSummary:
     report_code: str
     fight_filter: Optional[str]
@@ -115,17 +115,14 @@ def fetch_phase_summary(
     for fight_id, mapping in ghost_summary.roles_by_fight.items():
         roles_by_fight.setdefault(fight_id, {}).update(mapping)
 
-    hits_by_player_fight = dict(hit_summary.hits_by_player_fight)
+    # Regroup both per-player tallies by fight in a single pass each.
     hits_by_fight: Dict[int, Dict[str, int]] = defaultdict(dict)
-    for (player, fight_id), count in hits_by_player_fight.items():
+    for (player, fight_id), count in hit_summary.hits_by_player_fight.items():
         hits_by_fight[int(fight_id)][player] = count
 
-    ghost_counts_by_player_fight: Dict[Tuple[str, int], int] = {}
-    for (fight_id, player), count in ghost_summary.ghost_counts_by_player_fight.items():
-        ghost_counts_by_player_fight[(player, int(fight_id))] = count
     ghosts_by_fight: Dict[int, Dict[str, int]] = defaultdict(dict)
-    for (player, fight_id), count in ghost_counts_by_player_fight.items():
-        ghosts_by_fight[fight_id][player] = count
+    for (fight_id, player), count in ghost_summary.ghost_counts_by_player_fight.items():
+        ghosts_by_fight[int(fight_id)][player] = count
 
     players: Set[str] = set(hit_summary.total_hits.keys())
     players.update(ghost_summary.per_player_misses().keys())
@@ -154,7 +151,9 @@ def fetch_phase_summary(
         fight_roles = roles_by_fight.get(fight.id, {})
         hits_map = hits_by_fight.get(fight.id, {})
         ghosts_map = ghosts_by_fight.get(fight.id, {})
-        participants = set(fight_roles.keys()) | set(hits_map.keys()) | set(ghosts_map.keys())
+        participants = set(fight_roles)
+        participants.update(hits_map)
+        participants.update(ghosts_map)
         if not participants:
             continue
         for player in participants:
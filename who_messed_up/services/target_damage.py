@@ -9,7 +9,7 @@ from typing import DefaultDict, Dict, Iterable, List, Optional, Set
 
 import requests
 
-from ..api import fetch_events, fetch_fights, fetch_player_details, fetch_table
+from ..api import fetch_events, fetch_fights, fetch_player_details, fetch_table, shared_session
 from ..env import load_env
 from .boss_manifest_types import EncounterTargetBucket, EncounterTargetConfig
 from .common import (
@@ -155,7 +155,7 @@ def _fetch_single_encounter_target_damage_summary(
 ) -> EncounterTargetDamageSummary:
     load_env()
 
-    session = requests.Session()
+    session = shared_session()
     bearer = _resolve_token(token, client_id, client_secret)
 
     fights, actor_names, actor_classes, actor_owners = fetch_fights(session, bearer, report_code)